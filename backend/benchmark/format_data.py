@@ -0,0 +1,49 @@
+"""
+Benchmark of ``format_data_value``. Compares formatting time and code size against plain ``repr(list)``.
+
+Run from ``backend`` directory:
+```
+python -m benchmark.format_data
+```
+"""
+
+import timeit
+
+import numpy as np
+
+from src.generate_code import format_data_value
+
+
+def measure(function, repeat: int = 3) -> tuple[float, int]:
+    """Returns (best seconds, code size in bytes) of ``function``."""
+    seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+    return seconds, len(function())
+
+
+def main():
+    random_generator = np.random.default_rng(0)
+    print(f"{'points':>8} {'series':>8} {'method':>16} {'seconds':>9} {'bytes':>11}")
+
+    for size in (10**4, 10**5, 10**6):
+        series_dict = {
+            "random": (random_generator.random(size) * 1000).tolist(),
+            "linspace": np.linspace(0, 10, size).tolist(),
+        }
+        for series_name, value in series_dict.items():
+            method_dict = {
+                "repr(list)": lambda: repr(value),
+                "default": lambda: format_data_value(value),
+                "digits=6": lambda: format_data_value(value, significant_digits=6),
+                "digits=6,range": lambda: format_data_value(
+                    value, significant_digits=6, compact_range=True
+                ),
+            }
+            for method_name, function in method_dict.items():
+                seconds, code_size = measure(function)
+                print(
+                    f"{size:>8} {series_name:>8} {method_name:>16} {seconds:>9.4f} {code_size:>11}"
+                )
+
+
+if __name__ == "__main__":
+    main()
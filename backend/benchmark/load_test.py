@@ -0,0 +1,336 @@
+"""
+Local load test of Lambda handlers, simulating API Gateway WebSocket invocations.
+
+Each worker process plays a Lambda container. The first invocation of each worker is cold,
+importing every third-party library. A later invocation chosen by ``--cold-ratio`` drops every
+``src`` module of the worker and imports the handler again, which excludes third-party import time.
+Stages are recorded through ``RequestProfiler``, which every handler already calls per stage.
+
+Run from ``backend`` directory:
+```
+python -m benchmark.load_test --handler generate_code_only --requests 200 --concurrency 4 --cold-ratio 0.1
+```
+"""
+
+import argparse
+import base64
+import concurrent.futures
+import contextlib
+import gzip
+import importlib
+import json
+import random
+import resource
+import sys
+import time
+import tracemalloc
+import uuid
+
+from typing import Any, List, Optional
+
+import numpy as np
+
+HANDLER_MODULES = {
+    "generate_code_only": "src.generate_code_only",
+    "generate_code_and_image": "src.generate_code_and_image",
+}
+
+
+#################################################################
+#   Event Builder
+#################################################################
+
+
+def build_request_json(
+    row: int, column: int, data_size: int, random_generator: random.Random
+) -> dict:
+    """
+    Returns valid ``RequestElement`` JSON with ``row * column`` axes, one plot per axes.
+    """
+    request_json: dict[str, Any] = {
+        "request_id": str(uuid.UUID(int=random_generator.getrandbits(128), version=4)),
+        "figure": {
+            "size": {"row": row, "column": column},
+            "axes": [[f"ax-{i}-{j}" for j in range(column)] for i in range(row)],
+            "style": {"style_name": "style"},
+        },
+        "axes": [],
+        "plot": [],
+        "data": [{"name": "x", "value": [float(k) for k in range(data_size)]}],
+    }
+
+    for i in range(row):
+        for j in range(column):
+            request_json["axes"].append(
+                {
+                    "name": f"ax-{i}-{j}",
+                    "plot": [f"plot-{i}-{j}"],
+                    "style": {"style_name": "style"},
+                }
+            )
+            request_json["plot"].append(
+                {
+                    "name": f"plot-{i}-{j}",
+                    "data": {"relation": "plot", "x": "x", "y": f"y-{i}-{j}"},
+                    "style": {"style_name": "style"},
+                }
+            )
+            request_json["data"].append(
+                {
+                    "name": f"y-{i}-{j}",
+                    "value": [
+                        random_generator.uniform(-1, 1) for _ in range(data_size)
+                    ],
+                }
+            )
+
+    return request_json
+
+
+def build_event(
+    handler_name: str,
+    request_json: dict,
+    connection_id: str,
+    accept_encoding: List[str],
+) -> dict:
+    """Returns API Gateway WebSocket ``MESSAGE`` event carrying the request."""
+    message = {
+        "action": handler_name,
+        "request": request_json,
+        "accept_encoding": accept_encoding,
+    }
+    return {
+        "requestContext": {
+            "routeKey": handler_name,
+            "eventType": "MESSAGE",
+            "connectionId": connection_id,
+            "requestId": str(uuid.uuid4()),
+        },
+        "isBase64Encoded": False,
+        "body": json.dumps(message),
+    }
+
+
+#################################################################
+#   Worker (one process = one Lambda container)
+#################################################################
+
+
+def start_memory_trace() -> int:
+    """Resets the traced peak, and returns the currently traced memory. ``0`` if memory is not traced."""
+    if not StageRecorder.trace_memory:
+        return 0
+    tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def get_peak_memory() -> int:
+    """Returns the traced peak since the last ``start_memory_trace``. ``0`` if memory is not traced."""
+    return tracemalloc.get_traced_memory()[1] if StageRecorder.trace_memory else 0
+
+
+class StageRecorder:
+    """
+    Stand-in for ``RequestProfiler`` in handler modules. Records time and peak memory of each stage.
+
+    Peak memory of a stage is its peak minus the traced memory when it started,
+    so the memory held by imported libraries and earlier stages is not counted.
+    ``max_peak`` keeps the largest absolute peak of the stages, since each stage resets the peak.
+    """
+
+    records: dict[str, tuple[float, int]] = dict()
+    max_peak = 0
+    trace_memory = False
+
+    @classmethod
+    def start(cls, request_id: str, requested: bool = False, config: Any = None):
+        return cls()
+
+    @contextlib.contextmanager
+    def stage(self, stage_name: str):
+        start_memory = start_memory_trace()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            peak = get_peak_memory()
+            self.__class__.max_peak = max(self.__class__.max_peak, peak)
+            self.__class__.records[stage_name] = (
+                elapsed,
+                max(peak - start_memory, 0),
+            )
+
+    def dump(self, request_json: Any):
+        return None
+
+
+def _import_handler(handler_name: str, cold: bool):
+    """Imports handler module. If ``cold``, every ``src`` module is imported again."""
+    if cold:
+        for module_name in list(sys.modules):
+            if module_name == "src" or module_name.startswith("src."):
+                del sys.modules[module_name]
+    handler_module = importlib.import_module(HANDLER_MODULES[handler_name])
+    handler_module.RequestProfiler = StageRecorder
+    return handler_module
+
+
+def _initialize_worker(trace_memory: bool):
+    StageRecorder.trace_memory = trace_memory
+    if trace_memory:
+        tracemalloc.start()
+
+
+def is_success(response_message: Optional[str]) -> bool:
+    """Returns ``False`` if the handler failed without response, or replied an error response."""
+    if response_message is None:
+        return False
+    response = json.loads(response_message)
+    if "encoding" in response and "payload" in response:
+        payload = base64.b64decode(response["payload"])
+        if response["encoding"] == "gzip":
+            payload = gzip.decompress(payload)
+        elif response["encoding"] == "zstd":
+            import zstandard
+
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif response["encoding"] == "br":
+            import brotli
+
+            payload = brotli.decompress(payload)
+        response = json.loads(payload)
+    return response.get("type") != "error"
+
+
+def invoke(handler_name: str, event: dict, cold: bool) -> dict:
+    """
+    Invokes the handler once in this worker, and returns stage records.
+
+    Returns:
+        dict: {"ok": bool, "stages": {stage name -> (seconds, peak bytes)}, "max_rss": bytes}
+    """
+    StageRecorder.records = dict()
+    StageRecorder.max_peak = 0
+    stages: dict[str, tuple[float, int]] = dict()
+
+    is_cold = cold or HANDLER_MODULES[handler_name] not in sys.modules
+    start_memory = start_memory_trace()
+    start_time = time.perf_counter()
+    handler_module = _import_handler(handler_name, is_cold)
+    if is_cold:
+        stages["cold_start"] = (
+            time.perf_counter() - start_time,
+            max(get_peak_memory() - start_memory, 0),
+        )
+
+    start_memory = start_memory_trace()
+    start_time = time.perf_counter()
+    response_message = handler_module.lambda_handler(event, None)
+    elapsed = time.perf_counter() - start_time
+
+    # Stages reset the peak, so the handler peak is the largest of them and the rest
+    peak = max(get_peak_memory(), StageRecorder.max_peak)
+    stages["handler"] = (elapsed, max(peak - start_memory, 0))
+    stages.update(StageRecorder.records)
+
+    return {
+        "ok": is_success(response_message),
+        "stages": stages,
+        "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+
+
+#################################################################
+#   Report
+#################################################################
+
+
+def report(results: List[dict], wall_seconds: float):
+    """Prints throughput, latency percentiles and memory of each stage."""
+    succeeded = sum(result["ok"] for result in results)
+    print(
+        f"requests: {len(results)}  failed: {len(results) - succeeded}  "
+        f"wall: {wall_seconds:.2f}s  throughput: {len(results) / wall_seconds:.1f} req/s"
+    )
+    print(
+        f"{'stage':>16} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak MiB':>9}"
+    )
+
+    stage_names: List[str] = []
+    for result in results:
+        for stage_name in result["stages"]:
+            if stage_name not in stage_names:
+                stage_names.append(stage_name)
+
+    for stage_name in stage_names:
+        records = [
+            result["stages"][stage_name]
+            for result in results
+            if stage_name in result["stages"]
+        ]
+        seconds = np.array([record[0] for record in records]) * 1000
+        p50, p95, p99 = np.percentile(seconds, [50, 95, 99])
+        peak = max(record[1] for record in records) / 2**20
+        print(
+            f"{stage_name:>16} {len(records):>6} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f} {peak:>9.2f}"
+        )
+
+    max_rss = max(result["max_rss"] for result in results) / 2**20
+    print(f"max RSS of worker: {max_rss:.1f} MiB")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--handler", choices=list(HANDLER_MODULES), default="generate_code_only"
+    )
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--cold-ratio", type=float, default=0.0, help="ratio of cold invocations"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=8, help="number of WebSocket connections"
+    )
+    parser.add_argument("--row", type=int, default=2)
+    parser.add_argument("--column", type=int, default=2)
+    parser.add_argument("--data-size", type=int, default=1000)
+    parser.add_argument("--accept-encoding", nargs="*", default=["gzip"])
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="record peak memory of each stage, slows stages down",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random_generator = random.Random(args.seed)
+    invocations = []
+    for _ in range(args.requests):
+        request_json = build_request_json(
+            args.row, args.column, args.data_size, random_generator
+        )
+        connection_id = f"connection-{random_generator.randrange(args.sessions)}"
+        event = build_event(
+            args.handler, request_json, connection_id, args.accept_encoding
+        )
+        invocations.append(
+            (args.handler, event, random_generator.random() < args.cold_ratio)
+        )
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=args.concurrency,
+        initializer=_initialize_worker,
+        initargs=(args.trace_memory,),
+    ) as executor:
+        start_time = time.perf_counter()
+        futures = [executor.submit(invoke, *invocation) for invocation in invocations]
+        results = [future.result() for future in futures]
+        wall_seconds = time.perf_counter() - start_time
+
+    report(results, wall_seconds)
+
+
+if __name__ == "__main__":
+    main()
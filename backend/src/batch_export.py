@@ -0,0 +1,182 @@
+import base64
+import concurrent.futures
+import io
+import os
+
+from typing import Any, List, Optional
+
+from pydantic import ValidationError
+
+from .request_format import (
+    RequestElement,
+    CauseError,
+    get_pretty_validation_error,
+)
+from .generate_image import BatchExport
+from .generate_code_only import get_invalid_message_response
+from .lambda_control import lambda_log, lambda_response, ConnectionSender
+
+MAX_BATCH_REQUESTS = 64
+EXPORT_CHUNK_BYTES = 64 * 1024
+EXPORT_CONTENT_TYPES = {"pdf": "application/pdf", "zip": "application/zip"}
+ZIP_IMAGE_FORMATS = ("png", "svg", "pdf")
+
+
+def get_export_workers() -> int:
+    """
+    Number of threads rendering ZIP entries. ``EASYPLOTLIB_EXPORT_WORKERS``, serial by default.
+    Process pool is not offered, since AWS Lambda has no ``/dev/shm`` for ``multiprocessing``.
+    """
+    return max(int(os.environ.get("EASYPLOTLIB_EXPORT_WORKERS", "0")), 0)
+
+
+class ConnectionStream(io.RawIOBase):
+    """
+    Writable, non-seekable stream which sends written bytes to the connection as chunk messages.
+
+    API Gateway limits the size of one WebSocket message, so the exported file is sent in chunks as the below.
+    ```
+    {"type": "export_chunk", "index": 0, "payload": "<base64 of chunk>"}
+    ```
+
+    Attributes:
+        sender (ConnectionSender): connection to send chunks.
+        chunk_bytes (int): size of each chunk, except the last one.
+        chunk_count (int): number of chunks sent.
+        total_bytes (int): number of bytes written.
+    """
+
+    def __init__(self, sender: ConnectionSender, chunk_bytes: int = EXPORT_CHUNK_BYTES):
+        super().__init__()
+        self.sender = sender
+        self.chunk_bytes = chunk_bytes
+        self.chunk_count = 0
+        self.total_bytes = 0
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self.total_bytes += len(data)
+        while len(self._buffer) >= self.chunk_bytes:
+            self._send_chunk(bytes(self._buffer[: self.chunk_bytes]))
+            del self._buffer[: self.chunk_bytes]
+        return len(data)
+
+    def flush(self):
+        """Sends the rest of written bytes as the last chunk."""
+        if self._buffer:
+            self._send_chunk(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _send_chunk(self, chunk: bytes):
+        self.sender.send(
+            {
+                "type": "export_chunk",
+                "index": self.chunk_count,
+                "payload": base64.b64encode(chunk).decode(),
+            }
+        )
+        self.chunk_count += 1
+
+
+def validate_requests(
+    requests_json: Any,
+) -> tuple[List[RequestElement], List[CauseError]]:
+    """
+    Validates every request of the batch. Subfunction of ``batch_export``.
+    Returns (validated requests, errors). Sources of errors start with ``requests[index]``.
+    """
+    if not isinstance(requests_json, list) or not requests_json:
+        return [], [CauseError(source="requests", message="Requests is not a list")]
+    if len(requests_json) > MAX_BATCH_REQUESTS:
+        message = f"At most {MAX_BATCH_REQUESTS} requests can be exported at once"
+        return [], [CauseError(source="requests", message=message)]
+
+    request_models, errors = [], []
+    for index, request_json in enumerate(requests_json):
+        try:
+            request_models.append(RequestElement.model_validate(request_json))
+        except ValidationError as e:
+            for error in get_pretty_validation_error(e):
+                source = f"requests[{index}]" + error.source.removeprefix("request")
+                errors.append(CauseError(source=source, message=error.message))
+    return request_models, errors
+
+
+def batch_export(message: dict, sender: ConnectionSender) -> dict:
+    """
+    Validates the requests, and streams them into one PDF or ZIP through ``sender``. Subfunction of ``lambda_handler``.
+
+    Args:
+        message (dict): whole message body. ``requests``, ``format`` and ``image_format`` are read from here.
+        sender (ConnectionSender): connection to send progress events and chunks.
+    """
+    export_format = message.get("format", "pdf")
+    image_format = message.get("image_format", "png")
+    if not isinstance(export_format, str) or export_format not in EXPORT_CONTENT_TYPES:
+        cause_error = CauseError(source="format", message="Format is not pdf or zip")
+        return {"type": "error", "errors": [cause_error.model_dump()]}
+    if export_format == "zip" and (
+        not isinstance(image_format, str) or image_format not in ZIP_IMAGE_FORMATS
+    ):
+        cause_error = CauseError(
+            source="image_format", message="Image format is not png, svg or pdf"
+        )
+        return {"type": "error", "errors": [cause_error.model_dump()]}
+
+    request_models, errors = validate_requests(message.get("requests"))
+    if errors:
+        return {"type": "error", "errors": [error.model_dump() for error in errors]}
+
+    stream = ConnectionStream(sender, EXPORT_CHUNK_BYTES)
+    export_workers = get_export_workers()
+    executor: Optional[concurrent.futures.Executor] = None
+    if export_format == "zip" and export_workers > 0:
+        executor = concurrent.futures.ThreadPoolExecutor(export_workers)
+    try:
+        exporter = BatchExport(
+            request_models, executor, export_workers or None, sender.send
+        )
+        if export_format == "pdf":
+            exporter.export_pdf(stream)
+        else:
+            exporter.export_zip(stream, image_format)
+        stream.flush()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        "type": "export",
+        "content_type": EXPORT_CONTENT_TYPES[export_format],
+        "chunks": stream.chunk_count,
+        "size": stream.total_bytes,
+    }
+
+
+@lambda_log(log_when_success=False)
+@lambda_response
+def lambda_handler(event, context, message):
+    """
+    Entrypoint of API Gateway WebSocket route.
+
+    The message body is:
+    ```
+    {"action": "batch_export", "requests": [{...}, ...], "format": "pdf", "image_format": "png"}
+    ```
+    ``requests`` are ``RequestElement``, one per page or ZIP entry. ``format`` is "pdf" (default) or "zip",
+    and ``image_format`` is the image of each ZIP entry, "png" (default), "svg" or "pdf".
+
+    Before the response, progress event of each figure (see ``BatchExport``) and chunks of the file
+    (see ``ConnectionStream``) are sent to the connection, in the order they are written. The response is:
+    ```
+    {"type": "export", "content_type": "application/pdf", "chunks": 3, "size": 150000}
+    ```
+    Only ZIP entries are rendered in parallel, by ``EASYPLOTLIB_EXPORT_WORKERS`` threads. PDF pages are always serial.
+    """
+    if message is None:
+        return get_invalid_message_response()
+    return batch_export(message, ConnectionSender(event))
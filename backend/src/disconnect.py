@@ -0,0 +1,14 @@
+from .generate_code_only import code_diff_cache
+from .lambda_control import lambda_log
+
+
+@lambda_log(log_when_success=False)
+def lambda_handler(event, context):
+    """
+    Entrypoint of API Gateway WebSocket ``$disconnect`` route.
+
+    Drops the code of the closed connection from ``code_diff_cache``, so that it does not wait for LRU eviction.
+    ``$disconnect`` is best-effort in API Gateway, so ``CodeDiffCache.max_bytes`` still bounds the memory.
+    """
+    code_diff_cache.forget(event["requestContext"]["connectionId"])
+    return {"statusCode": 200}
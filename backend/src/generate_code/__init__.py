@@ -1 +1,3 @@
-from .generate_code import *
\ No newline at end of file
+from .generate_code import *
+from .code_diff import *
+from .format_data import *
@@ -0,0 +1,212 @@
+import collections, difflib, hashlib
+from typing import List, Mapping, Optional, Sequence
+
+
+class CodeDiffCache:
+    """
+    Keeps the last generated code of every session, and returns compact diff against it.
+
+    Generated code is handled as sections from ``GenerateCode.generate_sections()``.
+    Every response carries ``version``, a digest of the whole sections. When the client sends back
+    the version it currently holds, only changed sections are returned as line operations.
+    Otherwise (first request, evicted session, or stale client), full sections are returned so the client can resync.
+
+    1. full response: every section lines.
+        ```
+        {"type": "full", "version": "...", "sections": {"header": [...], "figure": [...], ...}}
+        ```
+
+    2. diff response: line operations for changed sections only. Unchanged sections are omitted.
+        ```
+        {"type": "diff", "base_version": "...", "version": "...", "sections": {"data": [["replace", 1, 2, ["data_y = [...]"]]]}}
+        ```
+
+    Each operation is ``[tag, begin, end, lines]``, meaning ``old_lines[begin:end] = lines``,
+    where ``tag`` is one of "replace", "delete", "insert". Indices refer to the base version,
+    so operations must be applied from the last one. See ``CodeDiffCache.apply_diff``.
+
+    Data line holds a whole series in one line, so a changed data line is sent as value patch instead.
+    ``["patch", i, i + 1, [begin, end, values]]`` means ``old_values[begin:end] = values``,
+    where ``old_values`` is the list literal of ``old_lines[i]`` split by ", ".
+    ```
+    data_y = [1.0, 2.0, 3.0]  ->  data_y = [1.0, 5.0, 3.0]  :  ["patch", i, i + 1, [1, 2, ["5.0"]]]
+    ```
+
+    Attributes:
+        max_sessions (int): maximum number of sessions to keep. Least recently used session is evicted first.
+        max_bytes (int): maximum total length of stored code. Least recently used session is evicted first.
+            Data lines of large series dominate the size, so this bounds the memory of a warm container.
+            Code longer than this alone is not stored, and always sent as full response.
+    """
+
+    def __init__(self, max_sessions: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # [session_id -> (version, sections, code length)]
+        self._sessions: collections.OrderedDict[
+            str, tuple[str, dict[str, tuple[str, ...]], int]
+        ] = collections.OrderedDict()
+
+    @staticmethod
+    def compute_version(sections: Mapping[str, Sequence[str]]) -> str:
+        """Returns digest of the given sections. Used as version token."""
+        digest = hashlib.blake2b(digest_size=16)
+        for section_name, section_lines in sections.items():
+            digest.update(section_name.encode())
+            digest.update(b"\0")
+            for line in section_lines:
+                digest.update(line.encode())
+                digest.update(b"\n")
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def split_values(line: str) -> Optional[tuple[str, List[str]]]:
+        """
+        Split data line ``name = [v1, v2, ...]`` into ``(name, [v1, v2, ...])``.
+        Returns ``None`` if ``line`` is not a list literal assignment.
+        """
+        name, separator, values = line.partition(" = [")
+        if not separator or not values.endswith("]"):
+            return None
+        values = values[:-1]
+        return name, (values.split(", ") if values else [])
+
+    @classmethod
+    def diff_values(cls, old_line: str, new_line: str) -> Optional[list]:
+        """
+        Returns ``[begin, end, values]`` which converts values of ``old_line`` into those of ``new_line``.
+        Returns ``None`` if either line is not a data line of the same name, or patch is not smaller than the line.
+        Only the changed range between common prefix and common suffix is sent, which is a single edit usually.
+        """
+        old_split, new_split = cls.split_values(old_line), cls.split_values(new_line)
+        if old_split is None or new_split is None or old_split[0] != new_split[0]:
+            return None
+        old_values, new_values = old_split[1], new_split[1]
+
+        common_length = min(len(old_values), len(new_values))
+        prefix = 0
+        while prefix < common_length and old_values[prefix] == new_values[prefix]:
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < common_length - prefix
+            and old_values[-1 - suffix] == new_values[-1 - suffix]
+        ):
+            suffix += 1
+
+        patch_values = new_values[prefix : len(new_values) - suffix]
+        if 2 * len(patch_values) >= len(new_values):
+            return None
+        return [prefix, len(old_values) - suffix, patch_values]
+
+    @classmethod
+    def diff_lines(
+        cls, old_lines: Sequence[str], new_lines: Sequence[str]
+    ) -> List[list]:
+        """Returns line operations which converts ``old_lines`` into ``new_lines``."""
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        operations = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            if tag == "replace" and i2 - i1 == j2 - j1:
+                # Patch each line if possible, else replace it
+                for i, j in zip(range(i1, i2), range(j1, j2)):
+                    patch = cls.diff_values(old_lines[i], new_lines[j])
+                    if patch is not None:
+                        operations.append(["patch", i, i + 1, patch])
+                    else:
+                        operations.append(["replace", i, i + 1, [new_lines[j]]])
+                continue
+            operations.append([tag, i1, i2, list(new_lines[j1:j2])])
+        return operations
+
+    @staticmethod
+    def apply_diff(
+        sections: dict[str, List[str]], diff_sections: dict[str, List[list]]
+    ) -> dict[str, List[str]]:
+        """
+        Applies ``sections`` of diff response into the base sections, and returns new sections.
+        This is the reference implementation of client side.
+        """
+        result = {name: list(lines) for name, lines in sections.items()}
+        for section_name, operations in diff_sections.items():
+            section_lines = result.setdefault(section_name, [])
+            for tag, begin, end, lines in reversed(operations):
+                if tag == "patch":
+                    value_begin, value_end, values = lines
+                    name, old_values = CodeDiffCache.split_values(section_lines[begin])
+                    old_values[value_begin:value_end] = values
+                    section_lines[begin] = f"{name} = [{', '.join(old_values)}]"
+                else:
+                    section_lines[begin:end] = lines
+        return result
+
+    def diff(
+        self,
+        session_id: str,
+        sections: Mapping[str, Sequence[str]],
+        client_version: Optional[str] = None,
+    ) -> dict:
+        """
+        Stores ``sections`` as the last code of ``session_id``, and returns response against the previous one.
+        Lines are stored as tuples, so that later change of given ``sections`` does not affect the stored one.
+
+        Args:
+            session_id (str): identifier of the client session, such as WebSocket connection id.
+            sections (Mapping[str, Sequence[str]]): result of ``GenerateCode.generate_sections()``.
+            client_version (Optional[str]): version the client currently holds. ``None`` forces full response.
+
+        Returns:
+            dict: full response or diff response. See class docstring for format.
+        """
+        # tuple() of tuple is itself, so already frozen lines are not copied
+        sections = {
+            section_name: tuple(section_lines)
+            for section_name, section_lines in sections.items()
+        }
+        version = self.compute_version(sections)
+        previous = self._pop_session(session_id)
+
+        code_bytes = sum(
+            len(line) for section_lines in sections.values() for line in section_lines
+        )
+        if code_bytes <= self.max_bytes:
+            self._sessions[session_id] = (version, sections, code_bytes)
+            self.total_bytes += code_bytes
+        while (
+            len(self._sessions) > self.max_sessions or self.total_bytes > self.max_bytes
+        ):
+            self._pop_session(next(iter(self._sessions)))
+
+        if previous is None or client_version is None or previous[0] != client_version:
+            return {"type": "full", "version": version, "sections": sections}
+
+        previous_sections = previous[1]
+        diff_sections = dict()
+        for section_name, section_lines in sections.items():
+            previous_lines = previous_sections.get(section_name, ())
+            if previous_lines != section_lines:
+                diff_sections[section_name] = self.diff_lines(
+                    previous_lines, section_lines
+                )
+
+        return {
+            "type": "diff",
+            "base_version": client_version,
+            "version": version,
+            "sections": diff_sections,
+        }
+
+    def _pop_session(self, session_id: str) -> Optional[tuple]:
+        """Removes and returns stored ``(version, sections, code length)`` of ``session_id``."""
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self.total_bytes -= session[2]
+        return session
+
+    def forget(self, session_id: str):
+        """Drops stored code of ``session_id``. Call this when the session is closed."""
+        self._pop_session(session_id)
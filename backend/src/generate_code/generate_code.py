@@ -2,6 +2,8 @@ import copy, itertools
 from typing import List, Optional
 
 from ..request_format.model import RequestElement
+from ..request_format.frozen import FrozenRequest
+from .format_data import format_data_value
 
 
 class GenerateCode:
@@ -36,17 +38,28 @@ class GenerateCode:
     To get complete code lines, call `GenerateCode.generate()`.
     Note that this class does NOT get any external variable except for ``RequestElement`` for ``__init__``.
     This means the behavior of this class solely depends on ``RequestElement``, including output format.
+    ``RequestElement`` is converted into ``FrozenRequest`` first, unless it is given already frozen.
 
     Attributes:
-        request (RequestElement): given request
+        request (FrozenRequest): given request, frozen
         plot_to_axes (dict): internal variable. For fast [plot name -> list of plot-calling axes name] searching.
         axes_to_figure_idx (dict): internal variable. For fast [axes name -> figure index] searching.
     """
 
     CODE_HEADER_IMPORT = ["import numpy as np", "import matplotlib.pyplot as plt"]
     CODE_FOOTER_RENDER = ['fig.savefig("figure.png")']
-
-    def __init__(self, request_model: RequestElement):
+    SECTION_TITLES = {
+        "header": None,
+        "figure": "# Figure Definition",
+        "axes": "# Axes Defintion",
+        "data": "# Data Definition",
+        "plot": "# Plot Definition",
+        "render": "# Render",
+    }
+
+    def __init__(self, request_model: RequestElement | FrozenRequest):
+        if isinstance(request_model, RequestElement):
+            request_model = FrozenRequest.from_model(request_model)
         self.request = request_model
         self.plot_to_axes = self._compile_plot_to_axes()
         self.axes_to_figure_idx = self._compile_axes_to_figure_idx()
@@ -77,8 +90,8 @@ class GenerateCode:
         """
         axes_to_figure_idx: dict[str, Optional[tuple[int, int]]] = dict()
         row_size, column_size = (
-            self.request.figure.size.row,
-            self.request.figure.size.column,
+            self.request.figure.row,
+            self.request.figure.column,
         )
 
         for axes_element in self.request.axes:
@@ -103,7 +116,7 @@ class GenerateCode:
         fig, axes = plt.subplot({row}, {column})
         ```
         """
-        row, column = self.request.figure.size.row, self.request.figure.size.column
+        row, column = self.request.figure.row, self.request.figure.column
         return [f"fig, axes = plt.subplots({row}, {column})"]
 
     def _generate_axes_lines(self) -> List[str]:
@@ -140,10 +153,17 @@ class GenerateCode:
         data_x = [....]
         data_y = [....]
         ```
+        Number format follows ``data_significant_digits`` and ``data_compact_range`` of figure style.
         """
         lines: List[str] = []
+        figure = self.request.figure
         for data_element in self.request.data:
-            lines.append(f"{data_element.name} = {data_element.value}")
+            data_code = format_data_value(
+                data_element.value,
+                significant_digits=figure.data_significant_digits,
+                compact_range=figure.data_compact_range,
+            )
+            lines.append(f"{data_element.name} = {data_code}")
         return lines
 
     def _generate_plot_lines(self) -> List[str]:
@@ -156,7 +176,7 @@ class GenerateCode:
         lines: List[str] = []
         # Traverse every plot
         for plot_element in self.request.plot:
-            plot_line = plot_element.to_code()
+            plot_line = plot_element.code
             axes_list = self.plot_to_axes[plot_element.name]
             # Each plot can be drawn into multiple axes, so traverse each axes
             # Note that if plot is never assigned to any axes, the loop will not be executed
@@ -175,7 +195,7 @@ class GenerateCode:
         """
         Subfunction of ``self.generate``
 
-        This method is executed when ``self.request.figure.style.code_is_function`` is True.
+        This method is executed when ``self.request.figure.code_is_function`` is True.
         Return the code as function form.
         """
         lines = []
@@ -185,40 +205,41 @@ class GenerateCode:
         """
         Subfunction of ``self.generate``.
 
-        This method is executed when ``self.request.figure.style.code_is_function`` is False.
+        This method is executed when ``self.request.figure.code_is_function`` is False.
         Return the code as procedure form.
         """
         lines = []
-        lines += self.__class__.CODE_HEADER_IMPORT
-        lines.append("")
-
-        lines.append(f"# Figure Definition")
-        lines += self._generate_figure_lines()
-        lines.append("")
-
-        lines.append(f"# Axes Defintion")
-        lines += self._generate_axes_lines()
-        lines.append("")
-
-        lines.append(f"# Data Definition")
-        lines += self._generate_data_lines()
-        lines.append("")
+        for section_name, section_lines in self.generate_sections().items():
+            section_title = self.__class__.SECTION_TITLES[section_name]
+            if section_title is not None:
+                lines.append(section_title)
+            lines += section_lines
+            lines.append("")
 
-        lines.append(f"# Plot Definition")
-        lines += self._generate_plot_lines()
-        lines.append("")
+        return "\n".join(lines)
 
-        lines.append(f"# Render")
-        lines += self.__class__.CODE_FOOTER_RENDER
-        lines.append("")
+    def generate_sections(self) -> dict[str, List[str]]:
+        """
+        Returns code lines of every section, keyed by section name in output order.
+        Section names are the keys of ``GenerateCode.SECTION_TITLES``.
 
-        return "\n".join(lines)
+        Unlike ``self.generate``, section titles and blank separator lines are not included.
+        ``CodeDiffCache`` uses this to compute diffs section by section.
+        """
+        return {
+            "header": list(self.__class__.CODE_HEADER_IMPORT),
+            "figure": self._generate_figure_lines(),
+            "axes": self._generate_axes_lines(),
+            "data": self._generate_data_lines(),
+            "plot": self._generate_plot_lines(),
+            "render": list(self.__class__.CODE_FOOTER_RENDER),
+        }
 
     def generate(self) -> List[str]:
         """
         Receives ``RequestElement`` and converts into executable Python code lines.
         """
-        if self.request.figure.style.code_is_function:
+        if self.request.figure.code_is_function:
             return self._merge_as_function()
         return self._merge_as_procedure()
 
@@ -0,0 +1,95 @@
+import base64
+import functools
+
+from typing import Any
+
+from pydantic import ValidationError
+
+from .request_format import (
+    RequestElement,
+    FrozenRequest,
+    get_pretty_validation_error,
+)
+from .generate_image import GenerateImage
+from .generate_code_only import (
+    code_diff_cache,
+    generate_sections,
+    get_invalid_message_response,
+)
+from .lambda_control import (
+    lambda_log,
+    lambda_response,
+    compress_result,
+    get_accepted_encodings,
+    RequestProfiler,
+)
+
+
+@functools.lru_cache(maxsize=16)
+def render_png(request_model: FrozenRequest) -> bytes:
+    """Cached ``GenerateImage.render("png")``. See ``generate_code_only.generate_sections``."""
+    return GenerateImage(request_model).render("png")
+
+
+def generate_code_and_image(request_json: Any, session_id: str, message: dict) -> dict:
+    """
+    Validates the request, and generates its code and PNG image. Subfunction of ``lambda_handler``.
+
+    Args:
+        request_json (Any): raw ``RequestElement``. Anything other than valid request results in error response.
+        session_id (str): WebSocket connection id. Key of ``code_diff_cache``.
+        message (dict): whole message body. ``version``, ``profile`` and ``accept_encoding`` are read from here.
+
+    PNG image is already compressed, so the response is marked as "image/png" and not compressed as a whole.
+    Only ``code`` is compressed with the negotiated encoding, into the envelope of ``encode_response``.
+    """
+    # request is not validated yet, so it may not be a dictionary
+    request_id = (
+        request_json.get("request_id") if isinstance(request_json, dict) else None
+    )
+    profiler = RequestProfiler.start(request_id, requested=bool(message.get("profile")))
+
+    try:
+        with profiler.stage("validate"):
+            request_model = FrozenRequest.from_model(
+                RequestElement.model_validate(request_json)
+            )
+    except ValidationError as e:
+        profiler.dump(request_json)
+        return {
+            "type": "error",
+            "errors": [error.model_dump() for error in get_pretty_validation_error(e)],
+        }
+
+    with profiler.stage("generate_code"):
+        sections = generate_sections(request_model)
+        code_response = code_diff_cache.diff(
+            session_id, sections, message.get("version")
+        )
+
+    with profiler.stage("render"):
+        image = render_png(request_model)
+
+    profiler.dump(request_json)
+    return {
+        "type": "code_and_image",
+        "content_type": "image/png",
+        "code": compress_result(
+            code_response, get_accepted_encodings(message), "application/json"
+        ),
+        "image": base64.b64encode(image).decode(),
+    }
+
+
+@lambda_log(log_when_success=False)
+@lambda_response
+def lambda_handler(event, context, message):
+    """
+    Entrypoint of API Gateway WebSocket route.
+
+    The message body is the same as ``generate_code_only.lambda_handler``, with "generate_code_and_image" action.
+    """
+    session_id = event["requestContext"]["connectionId"]
+    if message is None:
+        return get_invalid_message_response()
+    return generate_code_and_image(message.get("request"), session_id, message)
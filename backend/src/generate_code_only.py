@@ -0,0 +1,95 @@
+import functools
+import types
+
+from typing import Any, Mapping
+
+from pydantic import ValidationError
+
+from .request_format import (
+    RequestElement,
+    FrozenRequest,
+    CauseError,
+    get_pretty_validation_error,
+)
+from .generate_code import GenerateCode, CodeDiffCache
+from .lambda_control import lambda_log, lambda_response, RequestProfiler
+
+# Kept across warm invocations of the same Lambda container
+code_diff_cache = CodeDiffCache()
+
+
+@functools.lru_cache(maxsize=16)
+def generate_sections(request_model: FrozenRequest) -> Mapping[str, tuple[str, ...]]:
+    """
+    Cached ``GenerateCode.generate_sections()``.
+    ``FrozenRequest`` ignores ``request_id`` on hashing, so the same figure sent again skips generation.
+    The result is shared by every caller, so it is returned as read-only mapping of tuples.
+    """
+    sections = GenerateCode(request_model).generate_sections()
+    return types.MappingProxyType(
+        {section_name: tuple(lines) for section_name, lines in sections.items()}
+    )
+
+
+def get_invalid_message_response() -> dict:
+    """Error response of a message body which is not a JSON object. Shared by the WebSocket handlers."""
+    cause_error = CauseError(source="body", message="Message is not a JSON object")
+    return {"type": "error", "errors": [cause_error.model_dump()]}
+
+
+def generate_code_only(request_json: Any, session_id: str, message: dict) -> dict:
+    """
+    Validates the request and generates its code. Subfunction of ``lambda_handler``.
+
+    Args:
+        request_json (Any): raw ``RequestElement``. Anything other than valid request results in error response.
+        session_id (str): WebSocket connection id. Key of ``code_diff_cache``.
+        message (dict): whole message body. ``version`` and ``profile`` are read from here.
+    """
+    # request is not validated yet, so it may not be a dictionary
+    request_id = (
+        request_json.get("request_id") if isinstance(request_json, dict) else None
+    )
+    profiler = RequestProfiler.start(request_id, requested=bool(message.get("profile")))
+
+    try:
+        with profiler.stage("validate"):
+            request_model = FrozenRequest.from_model(
+                RequestElement.model_validate(request_json)
+            )
+    except ValidationError as e:
+        profiler.dump(request_json)
+        return {
+            "type": "error",
+            "errors": [error.model_dump() for error in get_pretty_validation_error(e)],
+        }
+
+    with profiler.stage("generate_code"):
+        sections = generate_sections(request_model)
+        code_response = code_diff_cache.diff(
+            session_id, sections, message.get("version")
+        )
+
+    profiler.dump(request_json)
+    return {"type": "code", "code": code_response}
+
+
+@lambda_log(log_when_success=False)
+@lambda_response
+def lambda_handler(event, context, message):
+    """
+    Entrypoint of API Gateway WebSocket route.
+
+    The message body is:
+    ```
+    {"action": "generate_code", "request": {...}, "version": "...", "profile": false, "accept_encoding": ["gzip"]}
+    ```
+    ``version`` is the code version the client holds (see ``CodeDiffCache``),
+    ``profile`` asks for profiling (see ``RequestProfiler``), and
+    ``accept_encoding`` lists encodings the client can decode (see ``encode_response``). All are optional.
+    ``message`` is the body parsed by ``lambda_response``, or ``None`` if it is not a JSON object.
+    """
+    session_id = event["requestContext"]["connectionId"]
+    if message is None:
+        return get_invalid_message_response()
+    return generate_code_only(message.get("request"), session_id, message)
@@ -0,0 +1,2 @@
+from .generate_image import *
+from .batch_export import *
@@ -0,0 +1,150 @@
+import collections
+import concurrent.futures
+import os
+import zipfile
+
+from typing import BinaryIO, Callable, Iterator, List, Optional
+
+from matplotlib.backends.backend_pdf import PdfPages
+
+from ..request_format.model import RequestElement
+from ..request_format.frozen import FrozenRequest
+from ..generate_code import GenerateCode
+from .generate_image import GenerateImage
+
+
+def render_entry(request_model: FrozenRequest, image_format: str) -> tuple[bytes, str]:
+    """
+    Task of render pool for ZIP export. Returns (image, code) of the request.
+    Module-level function, so that process pool can pickle it.
+    """
+    image = GenerateImage(request_model).render(image_format)
+    code = GenerateCode(request_model).generate()
+    return image, code
+
+
+class BatchExport:
+    """
+    Renders several ``RequestElement``, and streams them into one multi-page PDF or one ZIP.
+
+    Only ZIP is rendered in parallel, when ``executor`` is given. Requests are submitted into it,
+    but at most ``max_in_flight`` of them at once, and the results are written in request order as soon as they are ready.
+    So only a few rendered images are held in memory, regardless of the number of requests.
+    PDF is always rendered serially. See ``export_pdf``.
+
+    Without ``executor``, every request is rendered serially in the calling thread.
+    No pool is created here, since ``ProcessPoolExecutor`` needs ``/dev/shm``, which AWS Lambda does not have.
+
+    After each figure is written, ``progress`` is called with an event as the below.
+    ```
+    {"type": "progress", "index": 0, "total": 3, "request_id": "9b1deb4d-..."}
+    ```
+
+    Attributes:
+        request_models (List[RequestElement]): requests to export, in page order.
+        executor (Optional[concurrent.futures.Executor]): render pool of ZIP. If ``None``, rendered serially.
+        max_workers (Optional[int]): number of workers of ``executor``, which bounds tasks in flight.
+        progress (Optional[Callable[[dict], None]]): progress event callback.
+    """
+
+    def __init__(
+        self,
+        request_models: List[RequestElement],
+        executor: Optional[concurrent.futures.Executor] = None,
+        max_workers: Optional[int] = None,
+        progress: Optional[Callable[[dict], None]] = None,
+    ):
+        self.request_models = request_models
+        self.executor = executor
+        self.max_workers = max_workers
+        self.progress = progress
+
+    def _render_in_order(self, task: Callable, *task_args) -> Iterator:
+        """
+        Submits ``task(request_model, *task_args)`` for every request, and yields the results in request order.
+        Requests are frozen before submitted, which is also more compact to send to worker processes.
+        """
+        if self.executor is None:
+            for request_model in self.request_models:
+                yield task(FrozenRequest.from_model(request_model), *task_args)
+        else:
+            yield from self._submit_bounded(self.executor, task, *task_args)
+
+    def _submit_bounded(
+        self, executor: concurrent.futures.Executor, task: Callable, *task_args
+    ) -> Iterator:
+        """Subfunction of ``self._render_in_order``. Keeps at most ``max_in_flight`` tasks submitted."""
+        max_in_flight = 2 * (self.max_workers or os.cpu_count() or 1)
+        request_iterator = iter(self.request_models)
+        futures = collections.deque()
+
+        for request_model in request_iterator:
+            futures.append(
+                executor.submit(
+                    task, FrozenRequest.from_model(request_model), *task_args
+                )
+            )
+            if len(futures) >= max_in_flight:
+                break
+
+        while futures:
+            result = futures.popleft().result()
+            next_request_model = next(request_iterator, None)
+            if next_request_model is not None:
+                futures.append(
+                    executor.submit(
+                        task, FrozenRequest.from_model(next_request_model), *task_args
+                    )
+                )
+            yield result
+
+    def _notify(self, index: int):
+        """Emits progress event of ``index``-th request."""
+        if self.progress is not None:
+            self.progress(
+                {
+                    "type": "progress",
+                    "index": index,
+                    "total": len(self.request_models),
+                    "request_id": str(self.request_models[index].request_id),
+                }
+            )
+
+    def export_pdf(self, stream: BinaryIO):
+        """
+        Write every figure into ``stream`` as one page of PDF.
+
+        This is serial, and does not use the render pool. A page is drawn by ``PdfPages`` of this process,
+        so a worker could only build the ``Figure``, and pickling it back costs more than building it here.
+        Each figure is dropped after its page is written.
+
+        Note that ``PdfPages`` needs ``stream.tell()``. If ``stream`` does not support it,
+        matplotlib buffers the whole PDF in memory before writing.
+        """
+        with PdfPages(stream) as pdf_pages:
+            for index, request_model in enumerate(self.request_models):
+                frozen_request = FrozenRequest.from_model(request_model)
+                pdf_pages.savefig(GenerateImage(frozen_request).build_figure())
+                self._notify(index)
+
+    def export_zip(self, stream: BinaryIO, image_format: str = "png"):
+        """
+        Write every image and its generated code into ``stream`` as ZIP.
+
+        Entries are named ``{index}-{request_id}.{image_format}`` and ``{index}-{request_id}.py``.
+        PNG and JPEG images are stored as is, since they are already compressed.
+        """
+        if image_format in ("png", "jpg", "jpeg"):
+            image_compression = zipfile.ZIP_STORED
+        else:
+            image_compression = zipfile.ZIP_DEFLATED
+
+        with zipfile.ZipFile(stream, "w") as zip_file:
+            entries = self._render_in_order(render_entry, image_format)
+            for index, (image, code) in enumerate(entries):
+                entry_name = f"{index:03d}-{self.request_models[index].request_id}"
+                zip_file.writestr(
+                    f"{entry_name}.{image_format}", image, image_compression
+                )
+                zip_file.writestr(f"{entry_name}.py", code, zipfile.ZIP_DEFLATED)
+                self._notify(index)
@@ -0,0 +1,78 @@
+import io
+from typing import Optional
+
+from matplotlib.figure import Figure
+
+from ..request_format.model import RequestElement
+from ..request_format.frozen import FrozenRequest
+
+
+class GenerateImage:
+    """
+    Receives ``RequestElement`` and renders it into image, as the code of ``GenerateCode`` would do.
+
+    The figure is built with object-oriented API of matplotlib, not with ``pyplot``.
+    ``pyplot`` keeps global state, so it is not safe to render several requests concurrently.
+
+    Attributes:
+        request (FrozenRequest): given request, frozen
+    """
+
+    def __init__(self, request_model: RequestElement | FrozenRequest):
+        if isinstance(request_model, RequestElement):
+            request_model = FrozenRequest.from_model(request_model)
+        self.request = request_model
+
+    def build_figure(self) -> Figure:
+        """
+        Returns matplotlib ``Figure`` of the request.
+        Axes which are not assigned into any subplot are not rendered, as their code is commented out.
+        """
+        row, column = self.request.figure.row, self.request.figure.column
+        figure = Figure()
+        subplot_axes = figure.subplots(row, column, squeeze=False)
+
+        # [axes name -> matplotlib Axes]
+        axes_dict = dict()
+        for i in range(row):
+            for j in range(column):
+                axes_name = self.request.figure.axes[i][j]
+                if axes_name is not None:
+                    axes_dict.setdefault(axes_name, subplot_axes[i][j])
+
+        data_dict = {
+            data_element.name: data_element.value for data_element in self.request.data
+        }
+        plot_dict = {
+            plot_element.name: plot_element for plot_element in self.request.plot
+        }
+
+        for axes_element in self.request.axes:
+            axes = axes_dict.get(axes_element.name)
+            if axes is None:
+                continue
+            for plot_name in axes_element.plot:
+                plot_element = plot_dict[plot_name]
+                data_arguments = [
+                    data_dict[data_name] for data_name in plot_element.data_names
+                ]
+                plotting_function = getattr(axes, plot_element.relation)
+                plotting_function(*data_arguments, **dict(plot_element.style_items))
+
+        return figure
+
+    def render(
+        self, image_format: str = "png", figure: Optional[Figure] = None
+    ) -> bytes:
+        """
+        Render the request into image bytes of ``image_format``.
+
+        Args:
+            image_format (str): any format supported by ``Figure.savefig``, such as "png", "svg", "pdf".
+            figure (Optional[Figure]): figure from ``self.build_figure``. Built if ``None``.
+        """
+        if figure is None:
+            figure = self.build_figure()
+        image_buffer = io.BytesIO()
+        figure.savefig(image_buffer, format=image_format)
+        return image_buffer.getvalue()
@@ -1 +1,4 @@
-from .lambda_control import *
\ No newline at end of file
+from .lambda_control import *
+from .profiling import *
+from .compression import *
+from .connection import *
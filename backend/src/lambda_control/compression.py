@@ -0,0 +1,190 @@
+import base64
+import json
+import threading
+import zlib
+
+from typing import Any, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSION_THRESHOLD = 1024
+ALREADY_COMPRESSED_CONTENT_TYPES = {
+    "image/png",
+    "image/jpeg",
+    "image/webp",
+    "image/gif",
+    "application/zip",
+    "application/gzip",
+}
+
+
+def get_supported_encodings() -> List[str]:
+    """Returns encodings available in this environment, in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accepted_encodings: Optional[List[str]]) -> str:
+    """
+    Returns the most preferred encoding which both client and server support.
+    Returns "identity" if there is no such encoding.
+    """
+    if not accepted_encodings:
+        return "identity"
+    for encoding in get_supported_encodings():
+        if encoding in accepted_encodings:
+            return encoding
+    return "identity"
+
+
+class ResponseCompressor:
+    """
+    Compresses response payloads with one encoding.
+
+    Every compressed message is an independent frame, decodable without previous messages.
+    Consecutive messages of a WebSocket connection may be served by different Lambda containers,
+    so a stream shared across messages could not be decoded by the client.
+
+    Only zstd reuses its compression context across messages. gzip creates a new ``zlib.compressobj``
+    per message, and brotli uses one-shot ``brotli.compress``, since neither can be reset for a new frame.
+    ``zstandard.ZstdCompressor`` is not thread-safe, so each thread gets its own one.
+    ``ResponseCompressor`` itself can be shared across threads.
+
+    Attributes:
+        encoding (str): one of "zstd", "br", "gzip", "identity".
+        threshold (int): payloads smaller than this are not compressed.
+    """
+
+    def __init__(self, encoding: str, threshold: int = COMPRESSION_THRESHOLD):
+        self.encoding = encoding
+        self.threshold = threshold
+        if encoding not in ("zstd", "br", "gzip", "identity"):
+            raise ValueError(f"Invalid encoding: {encoding}")
+        self._thread_local = threading.local()
+
+    def _get_zstd_compressor(self) -> "zstandard.ZstdCompressor":
+        """Returns zstd compressor of the current thread, created on first use."""
+        zstd_compressor = getattr(self._thread_local, "zstd_compressor", None)
+        if zstd_compressor is None:
+            zstd_compressor = zstandard.ZstdCompressor(level=3)
+            self._thread_local.zstd_compressor = zstd_compressor
+        return zstd_compressor
+
+    def compress(
+        self, payload: bytes, content_type: str = "application/json"
+    ) -> tuple[str, bytes]:
+        """
+        Compress the given payload, if it is worth to compress.
+
+        Args:
+            payload (bytes): payload to compress.
+            content_type (str): MIME type of payload. Already compressed type is not compressed again.
+
+        Returns:
+            tuple[str, bytes]: (applied encoding, compressed payload). Encoding is "identity" if not compressed.
+        """
+        if (
+            self.encoding == "identity"
+            or len(payload) < self.threshold
+            or content_type in ALREADY_COMPRESSED_CONTENT_TYPES
+        ):
+            return "identity", payload
+
+        if self.encoding == "zstd":
+            return "zstd", self._get_zstd_compressor().compress(payload)
+        elif self.encoding == "br":
+            return "br", brotli.compress(payload, mode=brotli.MODE_TEXT, quality=5)
+        else:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            return "gzip", compressor.compress(payload) + compressor.flush()
+
+
+# Kept across warm invocations of the same Lambda container. [encoding -> ResponseCompressor]
+_response_compressors: dict[str, ResponseCompressor] = dict()
+
+
+def get_response_compressor(encoding: str) -> ResponseCompressor:
+    """Returns cached ``ResponseCompressor`` of the given encoding."""
+    if encoding not in _response_compressors:
+        _response_compressors[encoding] = ResponseCompressor(encoding)
+    return _response_compressors[encoding]
+
+
+def _compress_result(
+    result: Any,
+    accepted_encodings: Optional[List[str]],
+    content_type: Optional[str],
+) -> tuple[bytes, Optional[dict]]:
+    """
+    Subfunction of ``compress_result`` and ``encode_response``.
+    Returns (JSON payload of ``result``, compressed envelope). Envelope is ``None`` if not compressed.
+    """
+    if content_type is None:
+        content_type = "application/json"
+        if isinstance(result, dict):
+            content_type = result.get("content_type", content_type)
+
+    payload = json.dumps(result).encode()
+    compressor = get_response_compressor(negotiate_encoding(accepted_encodings))
+    encoding, compressed_payload = compressor.compress(payload, content_type)
+
+    if encoding == "identity":
+        return payload, None
+    return payload, {
+        "encoding": encoding,
+        "payload": base64.b64encode(compressed_payload).decode(),
+    }
+
+
+def compress_result(
+    result: Any,
+    accepted_encodings: Optional[List[str]] = None,
+    content_type: Optional[str] = None,
+) -> Any:
+    """
+    Returns ``result`` wrapped into the compressed envelope of ``encode_response``, or ``result`` as is if not compressed.
+
+    Use this to compress a part of the response only, such as generated code sent along with PNG image.
+    Arguments are the same as ``encode_response``.
+    """
+    _, envelope = _compress_result(result, accepted_encodings, content_type)
+    return result if envelope is None else envelope
+
+
+def encode_response(
+    result: Any,
+    accepted_encodings: Optional[List[str]] = None,
+    content_type: Optional[str] = None,
+) -> str:
+    """
+    Convert the result of handler into a WebSocket text message, compressed if negotiated.
+
+    Uncompressed result is sent as plain JSON. Compressed result is wrapped as the below.
+    ```
+    {"encoding": "gzip", "payload": "<base64 of compressed JSON>"}
+    ```
+
+    Args:
+        result (Any): JSON-serializable result of handler.
+        accepted_encodings (Optional[List[str]]): encodings the client can decode.
+        content_type (Optional[str]): MIME type of the content. If ``None``, ``result["content_type"]``
+            is used when exists, so that a result carrying PNG image is not compressed again.
+    """
+    payload, envelope = _compress_result(result, accepted_encodings, content_type)
+    if envelope is None:
+        return payload.decode()
+    return json.dumps(envelope)
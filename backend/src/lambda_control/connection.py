@@ -0,0 +1,47 @@
+import json
+import logging
+
+from typing import Any
+
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+
+class ConnectionSender:
+    """
+    Sends messages to the WebSocket connection of the event, before the handler returns.
+
+    The return value of the handler is only one message, sent after the handler finishes.
+    Messages on the way, such as progress events, are posted through API Gateway Management API.
+    ``boto3`` is bundled in AWS Lambda runtime. If it is not installed, messages are dropped with a warning.
+
+    Attributes:
+        connection_id (str): WebSocket connection id.
+        endpoint_url (str): API Gateway Management API endpoint of the WebSocket API.
+    """
+
+    def __init__(self, event: dict):
+        request_context = event["requestContext"]
+        self.connection_id = request_context["connectionId"]
+        self.endpoint_url = f"https://{request_context.get('domainName')}/{request_context.get('stage')}"
+        self._client = None
+
+    def _get_client(self):
+        """Returns API Gateway Management API client, created on first use. ``None`` without ``boto3``."""
+        if self._client is None and boto3 is not None:
+            self._client = boto3.client(
+                "apigatewaymanagementapi", endpoint_url=self.endpoint_url
+            )
+        return self._client
+
+    def send(self, message: Any):
+        """Sends ``message`` as JSON text message."""
+        client = self._get_client()
+        if client is None:
+            logging.getLogger().warning("boto3 is not installed, message is dropped")
+            return
+        client.post_to_connection(
+            ConnectionId=self.connection_id, Data=json.dumps(message).encode()
+        )
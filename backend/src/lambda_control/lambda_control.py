@@ -1,6 +1,11 @@
 import functools
+import json
 import logging
 
+from typing import List, Optional
+
+from .compression import encode_response
+
 _aws_cloudwatch_logger = logging.getLogger()
 _aws_cloudwatch_logger.setLevel(logging.INFO)
 
@@ -8,7 +13,7 @@ _aws_cloudwatch_logger.setLevel(logging.INFO)
 def lambda_log(log_when_success: bool):
     """
     Decorator. Logs when decorated function raises Exception.
-    
+
     When given function is executed, it wraps the function into try-catch block and executes it.
     You can decorate any function as you want.
 
@@ -48,17 +53,40 @@ def lambda_log(log_when_success: bool):
     return try_function_and_log
 
 
+def get_message(event: dict) -> Optional[dict]:
+    """Returns the WebSocket message body as dictionary. Returns ``None`` if the body is not a JSON object."""
+    try:
+        message = json.loads(event["body"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return message if isinstance(message, dict) else None
+
+
+def get_accepted_encodings(message: Optional[dict]) -> List[str]:
+    """Returns ``accept_encoding`` of the WebSocket message body, given by ``get_message``."""
+    if message is None:
+        return []
+    accepted_encodings = message.get("accept_encoding", [])
+    return accepted_encodings if isinstance(accepted_encodings, list) else []
+
+
 def lambda_response(given_function):
     """
     Decorator. Return the result of decorated function via WebSocket.
 
-    When given function is executed, its result will be directed into user response via Websocket.
-    Note that multiple @lambda_response is allowed, since this is websocket program.
+    The message body is parsed once here with ``get_message``, and passed down as the third argument,
+    so the decorated function is ``given_function(event, context, message)``. ``message`` is ``None``
+    if the body is not a JSON object. Large body takes long to parse, so never parse it again in the handler.
+
+    The result is compressed with the encoding negotiated from ``accept_encoding`` of the message body,
+    and returned as an encoded string. See ``encode_response`` for the message format.
+    So apply @lambda_response only once, as the innermost decorator.
     """
 
     @functools.wraps(given_function)
-    def wrapper(*args, **kwargs):
-        result = given_function(*args, **kwargs)
-        print("TODO: lambda_response")
+    def wrapper(event, context):
+        message = get_message(event)
+        result = given_function(event, context, message)
+        return encode_response(result, get_accepted_encodings(message))
 
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -0,0 +1,221 @@
+import contextlib
+import cProfile
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import random
+import re
+import tracemalloc
+
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+
+
+class ProfileConfig(BaseModel):
+    """
+    Switches for ``RequestProfiler``. Profiling is off unless one of the switches is on.
+
+    Attributes:
+        always (bool): profile every request. ``EASYPLOTLIB_PROFILE=1``
+        sample_rate (float): profile randomly sampled requests. ``EASYPLOTLIB_PROFILE_SAMPLE_RATE=0.01``
+        allow_request (bool): profile requests which ask for it. ``EASYPLOTLIB_PROFILE_ALLOW_REQUEST=1``
+        directory (str): where artifacts are written. ``EASYPLOTLIB_PROFILE_DIR``
+        top_allocations (int): number of allocation sites reported per stage. ``EASYPLOTLIB_PROFILE_TOP``
+    """
+
+    always: bool = False
+    sample_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    allow_request: bool = False
+    directory: str = "/tmp/easyplotlib-profile"
+    top_allocations: int = Field(default=20, gt=0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.always or self.sample_rate > 0 or self.allow_request
+
+    @classmethod
+    def from_env(cls) -> "ProfileConfig":
+        env = os.environ
+        return cls(
+            always=env.get("EASYPLOTLIB_PROFILE", "0") == "1",
+            sample_rate=env.get("EASYPLOTLIB_PROFILE_SAMPLE_RATE", "0"),
+            allow_request=env.get("EASYPLOTLIB_PROFILE_ALLOW_REQUEST", "0") == "1",
+            directory=env.get(
+                "EASYPLOTLIB_PROFILE_DIR", cls.model_fields["directory"].default
+            ),
+            top_allocations=env.get("EASYPLOTLIB_PROFILE_TOP", "20"),
+        )
+
+
+# Read once on cold start, so that disabled profiling costs nothing per request
+PROFILE_CONFIG = ProfileConfig.from_env()
+
+
+def get_request_shape(request_json: Any) -> Any:
+    """
+    Anonymise the given raw request, keeping only its structure.
+
+    Dictionary keys are kept, every string and number is replaced by its type name,
+    and list of numbers is replaced by its length. Works on invalid request as well.
+
+    Example:
+        >>> get_request_shape({"name": "secret", "value": [1, 2, 3]})
+        {"name": "str", "value": "number[3]"}
+    """
+    if isinstance(request_json, dict):
+        return {
+            str(key): get_request_shape(value) for key, value in request_json.items()
+        }
+    elif isinstance(request_json, list):
+        if all(
+            isinstance(item, (int, float)) and not isinstance(item, bool)
+            for item in request_json
+        ):
+            return f"number[{len(request_json)}]"
+        return [get_request_shape(item) for item in request_json]
+    elif request_json is None:
+        return None
+    else:
+        return type(request_json).__name__
+
+
+class _DisabledProfiler:
+    """Stand-in for ``RequestProfiler`` when profiling is off. Does nothing."""
+
+    _null_context = contextlib.nullcontext()
+
+    def stage(self, stage_name: str):
+        return self._null_context
+
+    def dump(self, request_json: Any) -> Optional[pathlib.Path]:
+        return None
+
+
+_DISABLED_PROFILER = _DisabledProfiler()
+
+
+class RequestProfiler:
+    """
+    Profiles each stage of a request with cProfile and tracemalloc, and dumps artifacts.
+
+    ```
+    profiler = RequestProfiler.start(request_id, requested=True)
+    with profiler.stage("validate"):
+        ...
+    with profiler.stage("generate_code"):
+        ...
+    profiler.dump(request_json)
+    ```
+
+    Artifacts are written into ``{config.directory}/{request_id}-{shape digest}/``.
+
+    * ``{stage}.prof``: cProfile stats of each stage. Open with ``pstats`` or ``snakeviz``.
+    * ``allocations.txt``: top allocation sites of each stage.
+    * ``shape.json``: anonymised request shape. See ``get_request_shape``.
+
+    Attributes:
+        request_id (str): request id, sanitised to be used as a directory name.
+        config (ProfileConfig): profiling config.
+        profiles (dict): internal variable. [stage name -> cProfile.Profile]
+        allocations (dict): internal variable. [stage name -> list of tracemalloc.StatisticDiff]
+    """
+
+    def __init__(self, request_id: str, config: ProfileConfig):
+        self.request_id = re.sub(r"[^0-9A-Za-z_-]", "", str(request_id)) or "unknown"
+        self.config = config
+        self.profiles: dict[str, cProfile.Profile] = dict()
+        self.allocations: dict[str, List[tracemalloc.StatisticDiff]] = dict()
+
+    @classmethod
+    def start(
+        cls,
+        request_id: str,
+        requested: bool = False,
+        config: Optional[ProfileConfig] = None,
+    ) -> "RequestProfiler | _DisabledProfiler":
+        """
+        Returns ``RequestProfiler`` if the request should be profiled, or a profiler doing nothing.
+
+        Args:
+            request_id (str): request id used as artifact key.
+            requested (bool): whether the request asked for profiling. Honoured only when ``config.allow_request``.
+            config (Optional[ProfileConfig]): profiling config. ``PROFILE_CONFIG`` if ``None``.
+        """
+        if config is None:
+            config = PROFILE_CONFIG
+        if not config.enabled:
+            return _DISABLED_PROFILER
+
+        if (
+            config.always
+            or (config.allow_request and requested)
+            or random.random() < config.sample_rate
+        ):
+            return cls(request_id, config)
+        return _DISABLED_PROFILER
+
+    @contextlib.contextmanager
+    def stage(self, stage_name: str):
+        """Profiles the code inside ``with`` block as ``stage_name``."""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        snapshot_before = tracemalloc.take_snapshot()
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            snapshot_after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+
+            ignore_tracemalloc = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            self.profiles[stage_name] = profile
+            self.allocations[stage_name] = snapshot_after.filter_traces(
+                ignore_tracemalloc
+            ).compare_to(snapshot_before.filter_traces(ignore_tracemalloc), "lineno")
+
+    def dump(self, request_json: Any) -> Optional[pathlib.Path]:
+        """
+        Write artifacts of every profiled stage, and returns the artifact directory.
+        Profiling must never break serving, so I/O error is logged and ``None`` is returned.
+
+        Args:
+            request_json (Any): raw request. Only its anonymised shape is written.
+        """
+        try:
+            return self._write_artifacts(request_json)
+        except OSError:
+            logging.getLogger().exception("Failed to dump profile artifacts")
+            return None
+
+    def _write_artifacts(self, request_json: Any) -> pathlib.Path:
+        """Subfunction of ``dump``."""
+        request_shape = get_request_shape(request_json)
+        shape_text = json.dumps(request_shape, sort_keys=True)
+        shape_digest = hashlib.blake2b(shape_text.encode(), digest_size=4).hexdigest()
+
+        artifact_directory = (
+            pathlib.Path(self.config.directory) / f"{self.request_id}-{shape_digest}"
+        )
+        artifact_directory.mkdir(parents=True, exist_ok=True)
+
+        with open(artifact_directory / "shape.json", "w") as fp:
+            json.dump(request_shape, fp, indent=2, sort_keys=True)
+
+        for stage_name, profile in self.profiles.items():
+            profile.dump_stats(artifact_directory / f"{stage_name}.prof")
+
+        with open(artifact_directory / "allocations.txt", "w") as fp:
+            for stage_name, statistics in self.allocations.items():
+                fp.write(f"# {stage_name}\n")
+                for statistic in statistics[: self.config.top_allocations]:
+                    fp.write(f"{statistic}\n")
+                fp.write("\n")
+
+        return artifact_directory
@@ -1,2 +1,3 @@
 from .model import *
-from .error_handle import *
\ No newline at end of file
+from .error_handle import *
+from .frozen import *
\ No newline at end of file
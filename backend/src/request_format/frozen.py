@@ -0,0 +1,186 @@
+import hashlib
+import sys
+
+from typing import Any, Optional
+
+import numpy as np
+
+from .model import (
+    RequestElement,
+    Figure,
+    AxesElement,
+    PlotElement,
+    DataElement,
+)
+
+
+def _intern(name: Optional[str]) -> Optional[str]:
+    return None if name is None else sys.intern(name)
+
+
+class FrozenElement:
+    """
+    Base class of validated, immutable representation of ``RequestElement``.
+
+    Every subclass lists its constructor arguments in ``_fields``. Attributes are set once in ``__init__``,
+    and any later assignment raises ``AttributeError``. Structural hash is computed once and cached,
+    so that frozen elements are cheap to use as dictionary keys.
+    """
+
+    __slots__ = ("_hash",)
+    _fields: tuple[str, ...] = ()
+
+    def __init__(self, *args):
+        for field_name, value in zip(self._fields, args, strict=True):
+            object.__setattr__(self, field_name, value)
+        object.__setattr__(self, "_hash", hash(self._structure()))
+
+    def _structure(self) -> tuple:
+        """Values compared by ``__eq__`` and ``__hash__``."""
+        return tuple(getattr(self, field_name) for field_name in self._fields)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: Any) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._hash == other._hash and self._structure() == other._structure()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        # Default pickling restores slots with setattr, which is forbidden
+        return (type(self), tuple(getattr(self, f) for f in self._fields))
+
+    def __repr__(self) -> str:
+        arguments = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields)
+        return f"{type(self).__name__}({arguments})"
+
+
+class FrozenFigure(FrozenElement):
+    """Frozen ``Figure``. ``FigureSize`` and ``FigureStyle`` are flattened into it."""
+
+    __slots__ = _fields = (
+        "row",
+        "column",
+        "axes",
+        "code_indent_style",
+        "code_is_function",
+        "data_significant_digits",
+        "data_compact_range",
+    )
+
+    @classmethod
+    def from_model(cls, figure: Figure) -> "FrozenFigure":
+        return cls(
+            figure.size.row,
+            figure.size.column,
+            tuple(
+                tuple(_intern(name) for name in axes_row) for axes_row in figure.axes
+            ),
+            figure.style.code_indent_style,
+            figure.style.code_is_function,
+            figure.style.data_significant_digits,
+            bool(figure.style.data_compact_range),
+        )
+
+
+class FrozenAxes(FrozenElement):
+    """Frozen ``AxesElement``. ``style_items`` is ``AxesStyle.get_style_dict()`` as tuple."""
+
+    __slots__ = _fields = ("name", "plot", "style_items")
+
+    @classmethod
+    def from_model(cls, axes_element: AxesElement) -> "FrozenAxes":
+        return cls(
+            sys.intern(axes_element.name),
+            tuple(sys.intern(plot_name) for plot_name in axes_element.plot),
+            tuple(axes_element.style.get_style_dict().items()),
+        )
+
+
+class FrozenPlot(FrozenElement):
+    """
+    Frozen ``PlotElement``.
+
+    Attributes:
+        name (str): plot name.
+        relation (str): plotting function name, such as "plot".
+        data_names (tuple[str, ...]): data names in argument order.
+        style_items (tuple[tuple[str, Any], ...]): style keyword arguments.
+        code (str): precomputed ``PlotElement.to_code()``.
+    """
+
+    __slots__ = _fields = ("name", "relation", "data_names", "style_items", "code")
+
+    @classmethod
+    def from_model(cls, plot_element: PlotElement) -> "FrozenPlot":
+        return cls(
+            sys.intern(plot_element.name),
+            sys.intern(plot_element.data.relation),
+            tuple(
+                sys.intern(data_name)
+                for data_name in plot_element.data.get_param_data_dict().values()
+            ),
+            tuple(plot_element.style.get_style_dict().items()),
+            plot_element.to_code(),
+        )
+
+
+class FrozenData(FrozenElement):
+    """
+    Frozen ``DataElement``. ``value`` is read-only ``float64`` array, compared by its digest.
+    """
+
+    __slots__ = ("name", "value", "value_digest")
+    _fields = ("name", "value")
+
+    def __init__(self, name: str, value: np.ndarray):
+        # Also applies to the array restored by pickle, which is writeable
+        value = np.asarray(value, dtype=np.float64)
+        value.flags.writeable = False
+        object.__setattr__(
+            self,
+            "value_digest",
+            hashlib.blake2b(memoryview(value), digest_size=16).digest(),
+        )
+        super().__init__(name, value)
+
+    def _structure(self) -> tuple:
+        return (self.name, self.value_digest)
+
+    @classmethod
+    def from_model(cls, data_element: DataElement) -> "FrozenData":
+        return cls(
+            sys.intern(data_element.name),
+            np.array(data_element.value, dtype=np.float64),
+        )
+
+
+class FrozenRequest(FrozenElement):
+    """
+    Validated, immutable representation of ``RequestElement``. Create with ``FrozenRequest.from_model``.
+
+    ``request_id`` is excluded from equality and hash, so two requests of the same figure are equal.
+    This makes ``FrozenRequest`` usable as cache key of generated code and image.
+    """
+
+    __slots__ = _fields = ("request_id", "figure", "axes", "plot", "data")
+
+    def _structure(self) -> tuple:
+        return (self.figure, self.axes, self.plot, self.data)
+
+    @classmethod
+    def from_model(cls, request_model: RequestElement) -> "FrozenRequest":
+        return cls(
+            str(request_model.request_id),
+            FrozenFigure.from_model(request_model.figure),
+            tuple(FrozenAxes.from_model(element) for element in request_model.axes),
+            tuple(FrozenPlot.from_model(element) for element in request_model.plot),
+            tuple(FrozenData.from_model(element) for element in request_model.data),
+        )
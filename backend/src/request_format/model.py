@@ -12,6 +12,7 @@ from pydantic import (
     ConfigDict,
     ValidationInfo,
     Field,
+    WithJsonSchema,
     field_validator,
     model_validator,
 )
@@ -45,12 +46,37 @@ def attach_data(given_name: str) -> str:
     return "data_" + given_name
 
 
-SafeIndentifier = Annotated[str, AfterValidator(validate_safe_identifier)]
+# JSON schema of names, for client-side pre-validation. The validators above remain authoritative.
+# The schema must never reject a name the validators accept, so it is looser than them:
+# every non-ASCII character is allowed, as ``str.isidentifier`` accepts many of them.
+# Prefixed names may be empty or start with a digit, since "axes_" or "data_" is attached before validation.
+_IDENTIFIER_CHARACTER_PATTERN = r"(?:[A-Za-z0-9_-]|[^\x00-\x7f])"
+SAFE_IDENTIFIER_SCHEMA = {
+    "type": "string",
+    "pattern": rf"^(?:[A-Za-z_-]|[^\x00-\x7f]){_IDENTIFIER_CHARACTER_PATTERN}*$",
+    "not": {"enum": keyword.kwlist},
+}
+SAFE_PREFIXED_IDENTIFIER_SCHEMA = {
+    "type": "string",
+    "pattern": rf"^{_IDENTIFIER_CHARACTER_PATTERN}*$",
+}
+
+SafeIndentifier = Annotated[
+    str,
+    AfterValidator(validate_safe_identifier),
+    WithJsonSchema(SAFE_IDENTIFIER_SCHEMA),
+]
 SafeAxesIndentifier = Annotated[
-    str, AfterValidator(attach_axes), AfterValidator(validate_safe_identifier)
+    str,
+    AfterValidator(attach_axes),
+    AfterValidator(validate_safe_identifier),
+    WithJsonSchema(SAFE_PREFIXED_IDENTIFIER_SCHEMA),
 ]
 SafeDataIndentifier = Annotated[
-    str, AfterValidator(attach_data), AfterValidator(validate_safe_identifier)
+    str,
+    AfterValidator(attach_data),
+    AfterValidator(validate_safe_identifier),
+    WithJsonSchema(SAFE_PREFIXED_IDENTIFIER_SCHEMA),
 ]
 
 #################################################################
@@ -63,11 +89,12 @@ class BaseStyle(BaseModel):
     style_name: Optional[SafeIndentifier]  # debug purpose attribute - not used
 
     def get_style_dict(self):
-        result = dict()
-        style_name_list = set(self.__dict__.keys()) - {"style_name"}
-        for param_name in style_name_list:
-            result[param_name] = self.__dict__[param_name]
-        return result
+        """Returns [style name -> value] dictionary, in field declaration order."""
+        return {
+            param_name: getattr(self, param_name)
+            for param_name in type(self).model_fields
+            if param_name != "style_name"
+        }
 
 
 #################################################################
@@ -84,6 +111,8 @@ class FigureSize(BaseModel):
 class FigureStyle(BaseStyle):
     code_indent_style: Optional[Literal["space", "tab"]] = Field(default="space")
     code_is_function: Optional[bool] = Field(default=True)
+    data_significant_digits: Optional[int] = Field(default=None, ge=1, le=17)
+    data_compact_range: Optional[bool] = Field(default=False)
 
 
 class Figure(BaseModel):
@@ -153,11 +182,12 @@ class BasePlotData(BaseModel):
         )
 
     def get_param_data_dict(self):
-        result = dict()
-        param_name_list = set(self.__dict__.keys()) - {"relation"}
-        for param_name in param_name_list:
-            result[param_name] = self.__dict__[param_name]
-        return result
+        """Returns [parameter name -> data name] dictionary, in argument order."""
+        return {
+            param_name: getattr(self, param_name)
+            for param_name in type(self).model_fields
+            if param_name != "relation"
+        }
 
 
 class SimplePlotData(BasePlotData):
@@ -321,7 +351,3 @@ class RequestElement(BaseModel):
             self.lookup_single_plot(plot_element, data_names)
 
         return self
-
-if __name__ == '__main__':
-    import json
-    print(json.dumps(RequestElement.model_json_schema(), indent=2))
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import typing
+
+from typing import Optional
+
+from .model import RequestElement, PlotDataSupported
+
+
+def get_cross_reference_constraints() -> dict:
+    """
+    Returns the constraints which ``RequestElement`` validators check across fields, in declarative form.
+    JSON schema cannot express them, so they are placed into ``x-cross-reference`` of the schema.
+
+    Paths are JSON pointers, where ``*`` matches every index of a list.
+    Names are compared after ``normalize``, as ``validate_safe_identifier`` replaces "-" with "_".
+    Both sides of each constraint carry the same prefix ("axes_", "data_"), so the prefix can be ignored.
+
+    1. unique: names under each path are unique. (``RequestElement.check_uniqueness``)
+    2. references: every name under ``source`` is one of the names under ``target``. ``null`` is allowed if ``nullable``.
+        (``check_figure_has_valid_axes``, ``check_axes_has_valid_plot``, ``check_plot_has_valid_data``)
+    3. shape: list under ``source`` has (``figure.size.row``, ``figure.size.column``) shape. (``Figure.check_axes_dimension``)
+    """
+    plot_data_fields = []
+    for plot_data_class in typing.get_args(PlotDataSupported) or (PlotDataSupported,):
+        for field_name in plot_data_class.model_fields:
+            if field_name != "relation" and field_name not in plot_data_fields:
+                plot_data_fields.append(field_name)
+
+    references = [
+        {"source": "/figure/axes/*/*", "target": "/axes/*/name", "nullable": True},
+        {"source": "/axes/*/plot/*", "target": "/plot/*/name", "nullable": False},
+    ]
+    for field_name in plot_data_fields:
+        references.append(
+            {
+                "source": f"/plot/*/data/{field_name}",
+                "target": "/data/*/name",
+                "nullable": False,
+            }
+        )
+
+    return {
+        "normalize": {"replace": {"-": "_"}},
+        "unique": ["/axes/*/name", "/plot/*/name", "/data/*/name"],
+        "references": references,
+        "shape": [
+            {
+                "source": "/figure/axes",
+                "shape": ["/figure/size/row", "/figure/size/column"],
+            }
+        ],
+    }
+
+
+class RequestSchema:
+    """
+    JSON schema of ``RequestElement`` for client-side pre-validation, built once on startup.
+
+    The schema is serialized canonically, so ``etag`` changes only when the schema changes.
+    Clients can cache it for long, and revalidate with ``If-None-Match``.
+
+    Attributes:
+        schema (dict): JSON schema with ``x-cross-reference``.
+        body (str): serialized schema.
+        etag (str): strong ETag of ``body``, quoted.
+    """
+
+    CACHE_CONTROL = "public, max-age=86400, stale-while-revalidate=604800"
+
+    def __init__(self):
+        self.schema = RequestElement.model_json_schema()
+        self.schema["x-cross-reference"] = get_cross_reference_constraints()
+        self.body = json.dumps(self.schema, sort_keys=True, separators=(",", ":"))
+        self.etag = f'"{hashlib.sha256(self.body.encode()).hexdigest()[:32]}"'
+
+    def get_response(self, if_none_match: Optional[str] = None) -> dict:
+        """
+        Returns API Gateway HTTP proxy response of the schema.
+        Returns 304 without body, if ``if_none_match`` has the current ETag.
+        """
+        headers = {"ETag": self.etag, "Cache-Control": self.CACHE_CONTROL}
+        if if_none_match is not None:
+            # If-None-Match uses weak comparison
+            client_etags = [
+                etag.strip().removeprefix("W/") for etag in if_none_match.split(",")
+            ]
+            if self.etag in client_etags or "*" in client_etags:
+                return {"statusCode": 304, "headers": headers, "body": ""}
+
+        headers["Content-Type"] = "application/schema+json"
+        return {"statusCode": 200, "headers": headers, "body": self.body}
+
+
+if __name__ == "__main__":
+    print(json.dumps(RequestSchema().schema, indent=2))
@@ -0,0 +1,20 @@
+from .request_format.schema import RequestSchema
+from .lambda_control import lambda_log
+
+# Built on cold start of this route only. Other handlers do not import the schema module.
+REQUEST_SCHEMA = RequestSchema()
+
+
+@lambda_log(log_when_success=False)
+def lambda_handler(event, context):
+    """
+    Entrypoint of API Gateway HTTP route ``GET /schema``.
+
+    Serves JSON schema of the request, so that the client can pre-validate it. See ``RequestSchema``.
+    The schema is built on cold start, so this only compares ETag.
+    """
+    headers = {
+        header_name.lower(): header_value
+        for header_name, header_value in (event.get("headers") or {}).items()
+    }
+    return REQUEST_SCHEMA.get_response(headers.get("if-none-match"))
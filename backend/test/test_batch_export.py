@@ -0,0 +1,69 @@
+import concurrent.futures
+import io
+import zipfile
+
+from src.request_format import RequestElement
+from src.generate_image import BatchExport
+from .test_helper import TestHelper
+
+
+def load_request_models(count):
+    json_object = TestHelper.load_testcase("requestformat-success-1.json")
+    return [RequestElement.model_validate(json_object) for _ in range(count)]
+
+
+def test_export_zip():
+    request_models = load_request_models(3)
+    events = []
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        batch_export = BatchExport(request_models, executor, 1, events.append)
+        stream = io.BytesIO()
+        batch_export.export_zip(stream)
+
+    assert [event["index"] for event in events] == [0, 1, 2]
+    assert all(event["total"] == 3 for event in events)
+
+    with zipfile.ZipFile(stream) as zip_file:
+        names = zip_file.namelist()
+        assert len(names) == 6
+        assert names[0] == f"000-{request_models[0].request_id}.png"
+        assert zip_file.read(names[0]).startswith(b"\x89PNG")
+        assert b"plt.subplots(2, 2)" in zip_file.read(names[1])
+
+
+def test_export_zip_with_process_pool():
+    # Frozen requests and results are pickled across processes
+    request_models = load_request_models(3)
+    stream = io.BytesIO()
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        BatchExport(request_models, executor, 2).export_zip(stream, "svg")
+
+    with zipfile.ZipFile(stream) as zip_file:
+        names = zip_file.namelist()
+        assert names[::2] == [
+            f"{index:03d}-{request_model.request_id}.svg"
+            for index, request_model in enumerate(request_models)
+        ]
+        assert b"<svg" in zip_file.read(names[0])
+        assert zip_file.getinfo(names[0]).compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_export_zip_serially():
+    request_models = load_request_models(2)
+    events = []
+    stream = io.BytesIO()
+    BatchExport(request_models, progress=events.append).export_zip(stream)
+    assert [event["index"] for event in events] == [0, 1]
+    with zipfile.ZipFile(stream) as zip_file:
+        assert len(zip_file.namelist()) == 4
+
+
+def test_export_pdf():
+    request_models = load_request_models(2)
+    events = []
+    stream = io.BytesIO()
+    BatchExport(request_models, progress=events.append).export_pdf(stream)
+
+    assert len(events) == 2
+    assert stream.getvalue().startswith(b"%PDF")
+    assert b"/Count 2" in stream.getvalue()
@@ -0,0 +1,110 @@
+from src.request_format import RequestElement
+from src.generate_code import GenerateCode, CodeDiffCache
+from .test_helper import TestHelper
+
+
+def load_sections(modify=None):
+    json_object = TestHelper.load_modified_testcase(
+        "requestformat-success-1.json", modify
+    )
+    request_model = RequestElement.model_validate(json_object)
+    return GenerateCode(request_model).generate_sections()
+
+
+def test_sections_match_generate():
+    json_object = TestHelper.load_testcase("requestformat-success-1.json")
+    generator = GenerateCode(RequestElement.model_validate(json_object))
+    sections = generator.generate_sections()
+    assert list(sections) == list(GenerateCode.SECTION_TITLES)
+
+    lines = []
+    for section_name, section_lines in sections.items():
+        section_title = GenerateCode.SECTION_TITLES[section_name]
+        if section_title is not None:
+            lines.append(section_title)
+        lines += section_lines
+        lines.append("")
+    assert "\n".join(lines) == generator.generate()
+
+
+def test_first_request_is_full():
+    cache = CodeDiffCache()
+    sections = load_sections()
+    response = cache.diff("session", sections, client_version=None)
+    assert response["type"] == "full"
+    assert response["sections"] == {
+        section_name: tuple(section_lines)
+        for section_name, section_lines in sections.items()
+    }
+    assert response["version"] == CodeDiffCache.compute_version(sections)
+
+
+def test_diff_only_changed_section():
+    cache = CodeDiffCache()
+    old_sections = load_sections()
+    version = cache.diff("session", old_sections)["version"]
+
+    def modify(json_object):
+        json_object["data"][1]["value"][0] = 100
+
+    new_sections = load_sections(modify)
+    response = cache.diff("session", new_sections, client_version=version)
+    assert response["type"] == "diff"
+    assert response["base_version"] == version
+    assert list(response["sections"]) == ["data"]
+    assert response["sections"]["data"] == [["patch", 1, 2, [0, 1, ["100.0"]]]]
+    assert CodeDiffCache.apply_diff(old_sections, response["sections"]) == new_sections
+
+
+def test_stale_version_resyncs():
+    cache = CodeDiffCache()
+    sections = load_sections()
+    cache.diff("session", sections)
+    response = cache.diff("session", sections, client_version="stale")
+    assert response["type"] == "full"
+
+
+def test_session_eviction():
+    cache = CodeDiffCache(max_sessions=1)
+    sections = load_sections()
+    version = cache.diff("first", sections)["version"]
+    cache.diff("second", sections)
+    assert cache.diff("first", sections, client_version=version)["type"] == "full"
+
+
+def test_byte_budget():
+    sections = load_sections()
+    code_bytes = sum(len(line) for lines in sections.values() for line in lines)
+    cache = CodeDiffCache(max_bytes=2 * code_bytes)
+    version = cache.diff("first", sections)["version"]
+    cache.diff("second", sections)
+    cache.diff("third", sections)
+    assert cache.total_bytes == 2 * code_bytes
+    assert cache.diff("first", sections, client_version=version)["type"] == "full"
+
+    cache.forget("first")
+    assert cache.total_bytes == code_bytes
+    assert list(cache._sessions) == ["third"]
+
+    # Code longer than the budget is never stored
+    small_cache = CodeDiffCache(max_bytes=code_bytes - 1)
+    version = small_cache.diff("session", sections)["version"]
+    assert small_cache.total_bytes == 0
+    response = small_cache.diff("session", sections, client_version=version)
+    assert response["type"] == "full"
+
+
+def test_diff_values_of_long_series():
+    old_values = [float(i) for i in range(100000)]
+    new_values = old_values[:500] + [-1.0, -2.0] + old_values[501:]
+    old_sections = {"data": [f"data_x = {old_values}", "data_y = [1.0]"]}
+    new_sections = {"data": [f"data_x = {new_values}", "data_y = [2.0, 3.0]"]}
+
+    diff_sections = {
+        "data": CodeDiffCache.diff_lines(old_sections["data"], new_sections["data"])
+    }
+    assert diff_sections["data"] == [
+        ["patch", 0, 1, [500, 501, ["-1.0", "-2.0"]]],
+        ["replace", 1, 2, ["data_y = [2.0, 3.0]"]],
+    ]
+    assert CodeDiffCache.apply_diff(old_sections, diff_sections) == new_sections
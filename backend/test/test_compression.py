@@ -0,0 +1,77 @@
+import base64, concurrent.futures, gzip, json
+
+import pytest
+
+from src.lambda_control import (
+    ResponseCompressor,
+    encode_response,
+    get_accepted_encodings,
+    negotiate_encoding,
+)
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None) == "identity"
+    assert negotiate_encoding(["deflate"]) == "identity"
+    assert negotiate_encoding(["gzip"]) == "gzip"
+
+
+def test_threshold_and_content_type():
+    compressor = ResponseCompressor("gzip", threshold=100)
+    assert compressor.compress(b"a" * 10) == ("identity", b"a" * 10)
+    assert compressor.compress(b"a" * 1000, "image/png") == ("identity", b"a" * 1000)
+    encoding, compressed = compressor.compress(b"a" * 1000)
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == b"a" * 1000
+
+
+def test_invalid_encoding():
+    with pytest.raises(ValueError):
+        ResponseCompressor("lzma")
+
+
+@pytest.mark.parametrize("encoding", ["zstd", "br"])
+def test_optional_encoding(encoding):
+    module = pytest.importorskip({"zstd": "zstandard", "br": "brotli"}[encoding])
+    compressor = ResponseCompressor(encoding, threshold=0)
+    for payload in (b"data_x = [1.0, 2.0]" * 100, b"data_y = [3.0]" * 100):
+        applied_encoding, compressed = compressor.compress(payload)
+        assert applied_encoding == encoding
+        if encoding == "zstd":
+            assert module.ZstdDecompressor().decompress(compressed) == payload
+        else:
+            assert module.decompress(compressed) == payload
+
+
+def test_zstd_compressor_per_thread():
+    zstandard = pytest.importorskip("zstandard")
+    compressor = ResponseCompressor("zstd", threshold=0)
+    payloads = [f"data_x = [{index}.0]".encode() * 1000 for index in range(32)]
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(compressor.compress, payloads))
+
+    decompressor = zstandard.ZstdDecompressor()
+    for payload, (_, compressed) in zip(payloads, results):
+        assert decompressor.decompress(compressed) == payload
+    assert compressor._get_zstd_compressor() is compressor._get_zstd_compressor()
+
+
+def test_encode_response():
+    result = {"type": "code", "code": "data_x = [1.0]\n" * 1000}
+    assert json.loads(encode_response(result)) == result
+
+    message = json.loads(encode_response(result, ["gzip"]))
+    assert message["encoding"] == "gzip"
+    payload = gzip.decompress(base64.b64decode(message["payload"]))
+    assert json.loads(payload) == result
+
+    image_result = {"type": "image", "content_type": "image/png", "image": "A" * 2000}
+    assert json.loads(encode_response(image_result, ["gzip"])) == image_result
+
+
+def test_get_accepted_encodings():
+    assert get_accepted_encodings({"accept_encoding": ["gzip", "br"]}) == ["gzip", "br"]
+    assert get_accepted_encodings({"accept_encoding": "gzip"}) == []
+    assert get_accepted_encodings({}) == []
+    assert get_accepted_encodings(None) == []
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+
+from src.request_format import RequestElement
+from src.generate_code import GenerateCode, format_data_value
+from .test_helper import TestHelper
+
+
+def evaluate(code):
+    return np.asarray(eval(code, {"np": np}), dtype=np.float64)
+
+
+def test_default_is_exact():
+    value = [0.1, 1 / 3, -2.0, 1e-300]
+    assert format_data_value(value) == repr(value)
+    assert format_data_value([]) == "[]"
+
+
+def test_significant_digits():
+    assert format_data_value([1 / 3, 2, 12345678], significant_digits=3) == (
+        "[0.333, 2, 1.23e+07]"
+    )
+
+
+def test_not_finite():
+    code = format_data_value([math.nan, math.inf, -math.inf, 1.5], significant_digits=2)
+    assert code == "[np.nan, np.inf, -np.inf, 1.5]"
+    assert np.isnan(evaluate(code)[0])
+
+
+def test_compact_range():
+    assert format_data_value([1, 2, 3, 4], compact_range=True) == (
+        "np.linspace(1.0, 4.0, 4)"
+    )
+    assert format_data_value([1, 2, 4], compact_range=True) == "[1.0, 2.0, 4.0]"
+
+    value = (np.arange(1000) * 0.1).tolist()
+    code = format_data_value(value, significant_digits=6, compact_range=True)
+    assert code == "np.linspace(0, 99.9, 1000)"
+    assert np.allclose(evaluate(code), value)
+
+    # Small value off the range keeps its significant digits
+    value = np.linspace(-100, 100, 2001)
+    value[1000] = 3e-5
+    code = format_data_value(value, significant_digits=6, compact_range=True)
+    assert not code.startswith("np.linspace")
+    assert "3e-05" in code
+
+
+def test_generate_data_lines():
+    json_object = TestHelper.load_testcase("requestformat-success-1.json")
+    json_object["figure"]["style"]["data_significant_digits"] = 4
+    json_object["figure"]["style"]["data_compact_range"] = True
+    request_model = RequestElement.model_validate(json_object)
+    data_lines = GenerateCode(request_model).generate_sections()["data"]
+    assert data_lines[0] == "data_x = np.linspace(1, 10, 10)"
+    assert data_lines[1].startswith("data_y1 = [0, -3, -8")
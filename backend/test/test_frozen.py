@@ -0,0 +1,65 @@
+import pickle
+import uuid
+
+import pytest
+
+from src.request_format import RequestElement, FrozenRequest
+from src.generate_code import GenerateCode
+from .test_helper import TestHelper
+
+
+def load_frozen(modify=None):
+    json_object = TestHelper.load_modified_testcase(
+        "requestformat-success-1.json", modify
+    )
+    return FrozenRequest.from_model(RequestElement.model_validate(json_object))
+
+
+def test_immutable():
+    frozen_request = load_frozen()
+    with pytest.raises(AttributeError):
+        frozen_request.figure = None
+    with pytest.raises(AttributeError):
+        frozen_request.plot[0].code = ""
+    with pytest.raises(ValueError):
+        frozen_request.data[0].value[0] = 0
+    assert not hasattr(frozen_request, "__dict__")
+
+
+def test_structural_equality():
+    def change_request_id(json_object):
+        json_object["request_id"] = str(uuid.uuid4())
+
+    def change_data(json_object):
+        json_object["data"][0]["value"][0] = 100
+
+    frozen_request = load_frozen()
+    assert frozen_request == load_frozen(change_request_id)
+    assert hash(frozen_request) == hash(load_frozen(change_request_id))
+    assert frozen_request != load_frozen(change_data)
+    assert {frozen_request: 1}[load_frozen(change_request_id)] == 1
+
+
+def test_interned_names():
+    frozen_request = load_frozen()
+    assert frozen_request.plot[0].name is frozen_request.axes[0].plot[0]
+    assert frozen_request.plot[0].data_names == ("data_x", "data_y1")
+
+
+def test_pickle():
+    frozen_request = load_frozen()
+    restored_request = pickle.loads(pickle.dumps(frozen_request))
+    assert restored_request == frozen_request
+    assert restored_request.request_id == frozen_request.request_id
+    with pytest.raises(ValueError):
+        restored_request.data[0].value[0] = 0
+
+
+def test_generate_code_accepts_both():
+    json_object = TestHelper.load_testcase("requestformat-success-1.json")
+    request_model = RequestElement.model_validate(json_object)
+    frozen_request = FrozenRequest.from_model(request_model)
+    assert (
+        GenerateCode(request_model).generate()
+        == GenerateCode(frozen_request).generate()
+    )
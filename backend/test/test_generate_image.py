@@ -0,0 +1,20 @@
+from src.request_format import RequestElement
+from src.generate_image import GenerateImage
+from .test_helper import TestHelper
+
+
+def test_generate_image():
+    json_object = TestHelper.load_testcase("requestformat-success-1.json")
+    request_model = RequestElement.model_validate(json_object)
+    image_factory = GenerateImage(request_model)
+
+    figure = image_factory.build_figure()
+    # axes_default_ax_1_0 is not assigned into any subplot, so its plot is not drawn
+    line_counts = [len(axes.get_lines()) for axes in figure.axes]
+    assert line_counts == [1, 1, 0, 3]
+    assert (
+        list(figure.axes[0].get_lines()[0].get_ydata())
+        == json_object["data"][1]["value"]
+    )
+
+    assert image_factory.render("png", figure).startswith(b"\x89PNG")
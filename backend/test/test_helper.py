@@ -1,5 +1,5 @@
 import os, pathlib, json
-from typing import List, Any
+from typing import Any, Callable, List, Optional
 
 class TestHelper:
     """
@@ -64,3 +64,17 @@ class TestHelper:
         with open(cls.TEST_DATA_DIRECTORY / filename) as fp:
             json_content = json.load(fp)
         return json_content
+
+    @classmethod
+    def load_modified_testcase(
+        cls, filename: str, modify: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Read the given testcase file like ``load_testcase``, and apply ``modify`` to the object in place.
+
+        Use this to derive a testcase from an existing one, such as changing one value of ``data``.
+        """
+        json_content = cls.load_testcase(filename)
+        if modify is not None:
+            modify(json_content)
+        return json_content
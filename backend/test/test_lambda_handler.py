@@ -0,0 +1,158 @@
+import base64, gzip, io, json, zipfile
+
+import pytest
+
+from src import batch_export, disconnect, generate_code_only, generate_code_and_image
+from src.lambda_control import ConnectionSender
+from src.request_format import RequestElement, FrozenRequest
+from .test_helper import TestHelper
+
+
+def build_event(message):
+    return {
+        "requestContext": {"connectionId": "connection"},
+        "body": json.dumps(message),
+    }
+
+
+@pytest.mark.parametrize(
+    "handler_module", [generate_code_only, generate_code_and_image]
+)
+@pytest.mark.parametrize("request_json", [None, [], "request", 3])
+def test_non_dict_request(handler_module, request_json):
+    response_message = handler_module.lambda_handler(
+        build_event({"request": request_json}), None
+    )
+    response = json.loads(response_message)
+    assert response["type"] == "error"
+    assert response["errors"][0]["source"] == "request"
+
+
+@pytest.mark.parametrize(
+    "handler_module", [generate_code_only, generate_code_and_image]
+)
+@pytest.mark.parametrize("body", ["[]", "not json", '"request"', None])
+def test_invalid_body(handler_module, body):
+    event = {"requestContext": {"connectionId": "connection"}, "body": body}
+    response = json.loads(handler_module.lambda_handler(event, None))
+    assert response["type"] == "error"
+    assert response["errors"][0]["source"] == "body"
+
+
+def test_generate_code_only():
+    request_json = TestHelper.load_testcase("requestformat-success-1.json")
+    response_message = generate_code_only.lambda_handler(
+        build_event({"request": request_json}), None
+    )
+    response = json.loads(response_message)
+    assert response["type"] == "code"
+    assert response["code"]["type"] == "full"
+
+
+def test_generate_code_and_image_compresses_code_only():
+    request_json = TestHelper.load_testcase("requestformat-success-1.json")
+    response_message = generate_code_and_image.lambda_handler(
+        build_event({"request": request_json, "accept_encoding": ["gzip"]}), None
+    )
+    response = json.loads(response_message)
+    assert response["type"] == "code_and_image"
+    assert response["content_type"] == "image/png"
+    assert base64.b64decode(response["image"]).startswith(b"\x89PNG")
+
+    assert response["code"]["encoding"] == "gzip"
+    payload = gzip.decompress(base64.b64decode(response["code"]["payload"]))
+    assert json.loads(payload)["type"] == "full"
+
+
+def test_cached_sections_are_immutable():
+    request_json = TestHelper.load_testcase("requestformat-success-1.json")
+    request_model = FrozenRequest.from_model(
+        RequestElement.model_validate(request_json)
+    )
+    sections = generate_code_only.generate_sections(request_model)
+    assert generate_code_only.generate_sections(request_model) is sections
+    with pytest.raises(TypeError):
+        sections["data"] = ()
+    assert isinstance(sections["data"], tuple)
+
+
+def test_disconnect_forgets_session():
+    request_json = TestHelper.load_testcase("requestformat-success-1.json")
+    event = build_event({"request": request_json})
+    generate_code_only.lambda_handler(event, None)
+    assert "connection" in generate_code_only.code_diff_cache._sessions
+
+    assert disconnect.lambda_handler(event, None) == {"statusCode": 200}
+    assert "connection" not in generate_code_only.code_diff_cache._sessions
+
+
+@pytest.mark.parametrize(
+    "handler_module", [generate_code_only, generate_code_and_image]
+)
+def test_body_is_parsed_once(handler_module, monkeypatch):
+    request_json = TestHelper.load_testcase("requestformat-success-1.json")
+    event = build_event({"request": request_json, "accept_encoding": ["gzip"]})
+    parsed_bodies = []
+    json_loads = json.loads
+
+    def counting_loads(text, *args, **kwargs):
+        parsed_bodies.append(text)
+        return json_loads(text, *args, **kwargs)
+
+    monkeypatch.setattr(json, "loads", counting_loads)
+    handler_module.lambda_handler(event, None)
+    assert parsed_bodies == [event["body"]]
+
+
+@pytest.fixture
+def sent_messages(monkeypatch):
+    messages = []
+    monkeypatch.setattr(
+        ConnectionSender, "send", lambda self, message: messages.append(message)
+    )
+    return messages
+
+
+def receive_export(sent_messages):
+    chunks = [message for message in sent_messages if message["type"] == "export_chunk"]
+    assert [chunk["index"] for chunk in chunks] == list(range(len(chunks)))
+    return b"".join(base64.b64decode(chunk["payload"]) for chunk in chunks)
+
+
+@pytest.mark.parametrize("export_format", ["pdf", "zip"])
+def test_batch_export(export_format, sent_messages, monkeypatch):
+    monkeypatch.setattr(batch_export, "EXPORT_CHUNK_BYTES", 4096)
+    monkeypatch.setenv("EASYPLOTLIB_EXPORT_WORKERS", "2")
+    request_json = TestHelper.load_testcase("requestformat-success-1.json")
+    message = {"requests": [request_json, request_json], "format": export_format}
+    response = json.loads(batch_export.lambda_handler(build_event(message), None))
+
+    assert response["type"] == "export"
+    progress_events = [m for m in sent_messages if m["type"] == "progress"]
+    assert [event["index"] for event in progress_events] == [0, 1]
+    exported = receive_export(sent_messages)
+    assert len(exported) == response["size"]
+    assert response["chunks"] == -(-response["size"] // 4096)
+    assert response["chunks"] == len(sent_messages) - 2
+
+    if export_format == "pdf":
+        assert response["content_type"] == "application/pdf"
+        assert exported.startswith(b"%PDF") and b"/Count 2" in exported
+    else:
+        with zipfile.ZipFile(io.BytesIO(exported)) as zip_file:
+            assert len(zip_file.namelist()) == 4
+
+
+def test_batch_export_errors(sent_messages):
+    request_json = TestHelper.load_testcase("requestformat-success-1.json")
+    message = {"requests": [request_json, {"request_id": "x"}]}
+    response = json.loads(batch_export.lambda_handler(build_event(message), None))
+    assert response["type"] == "error"
+    assert all(
+        error["source"].startswith("requests[1]") for error in response["errors"]
+    )
+
+    message = {"requests": [request_json], "format": "tar"}
+    response = json.loads(batch_export.lambda_handler(build_event(message), None))
+    assert response["errors"][0]["source"] == "format"
+    assert sent_messages == []
@@ -0,0 +1,59 @@
+from src.lambda_control import ProfileConfig, RequestProfiler, get_request_shape
+
+
+def test_disabled_profiler(tmp_path):
+    config = ProfileConfig(directory=str(tmp_path))
+    profiler = RequestProfiler.start("some-id", requested=True, config=config)
+    assert not isinstance(profiler, RequestProfiler)
+    with profiler.stage("validate"):
+        pass
+    assert profiler.dump({}) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_request_flag(tmp_path):
+    config = ProfileConfig(allow_request=True, directory=str(tmp_path))
+    assert isinstance(
+        RequestProfiler.start("id", requested=True, config=config), RequestProfiler
+    )
+    assert not isinstance(
+        RequestProfiler.start("id", requested=False, config=config), RequestProfiler
+    )
+
+
+def test_dump_artifacts(tmp_path):
+    config = ProfileConfig(always=True, directory=str(tmp_path))
+    profiler = RequestProfiler.start("../9b1deb4d", config=config)
+    with profiler.stage("generate_code"):
+        [str(number) for number in range(1000)]
+
+    artifact_directory = profiler.dump({"request_id": "9b1deb4d", "data": [1, 2]})
+    assert artifact_directory.parent == tmp_path
+    assert artifact_directory.name.startswith("9b1deb4d-")
+    assert (artifact_directory / "generate_code.prof").exists()
+    assert (artifact_directory / "shape.json").exists()
+    assert "# generate_code" in (artifact_directory / "allocations.txt").read_text()
+
+
+def test_dump_error_is_not_raised(tmp_path):
+    # A file where the directory should be, as a full or read-only directory
+    blocking_file = tmp_path / "profile"
+    blocking_file.write_text("")
+    config = ProfileConfig(always=True, directory=str(blocking_file))
+    profiler = RequestProfiler.start("9b1deb4d", config=config)
+    with profiler.stage("validate"):
+        pass
+    assert profiler.dump({}) is None
+
+
+def test_request_shape():
+    request_json = {
+        "request_id": "9b1deb4d",
+        "figure": {"size": {"row": 1, "column": 2}, "axes": [["secret", None]]},
+        "data": [{"name": "secret", "value": [1, 2.5, 3]}],
+    }
+    assert get_request_shape(request_json) == {
+        "request_id": "str",
+        "figure": {"size": {"row": "int", "column": "int"}, "axes": [["str", None]]},
+        "data": [{"name": "str", "value": "number[3]"}],
+    }
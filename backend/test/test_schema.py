@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from src.request_format import RequestElement
+from src.request_format.schema import RequestSchema
+from src.request_schema import REQUEST_SCHEMA, lambda_handler
+from .test_helper import TestHelper
+
+
+def test_etag_is_stable():
+    assert RequestSchema().etag == REQUEST_SCHEMA.etag
+    assert json.loads(REQUEST_SCHEMA.body) == REQUEST_SCHEMA.schema
+
+
+def test_name_pattern():
+    plot_name_schema = REQUEST_SCHEMA.schema["$defs"]["PlotElement"]["properties"][
+        "name"
+    ]
+    assert plot_name_schema["pattern"] == (
+        r"^(?:[A-Za-z_-]|[^\x00-\x7f])(?:[A-Za-z0-9_-]|[^\x00-\x7f])*$"
+    )
+    assert "class" in plot_name_schema["not"]["enum"]
+
+
+def rename_data_and_axes(json_object):
+    # Names the server accepts, as "data_" or "axes_" is attached before validation
+    json_object["data"][0]["name"] = ""
+    json_object["data"][1]["name"] = "αβ"
+    for plot_element in json_object["plot"]:
+        plot_element["data"]["x"] = ""
+        if plot_element["data"]["y"] == "y1":
+            plot_element["data"]["y"] = "αβ"
+
+    json_object["axes"][0]["name"] = "1-αβ"
+    json_object["figure"]["axes"][0][0] = "1-αβ"
+
+
+@pytest.mark.parametrize("modify", [None, rename_data_and_axes])
+def test_schema_accepts_success_request(modify):
+    jsonschema = pytest.importorskip("jsonschema")
+    json_object = TestHelper.load_modified_testcase(
+        "requestformat-success-1.json", modify
+    )
+
+    # Pre-validation must never block a request the server accepts
+    RequestElement.model_validate(json_object)
+    jsonschema.validate(json_object, REQUEST_SCHEMA.schema)
+
+
+def test_cross_reference():
+    constraints = REQUEST_SCHEMA.schema["x-cross-reference"]
+    assert "/data/*/name" in constraints["unique"]
+    assert {
+        "source": "/plot/*/data/y",
+        "target": "/data/*/name",
+        "nullable": False,
+    } in constraints["references"]
+    assert constraints["shape"][0]["source"] == "/figure/axes"
+
+
+@pytest.mark.parametrize(
+    "if_none_match, status_code",
+    [
+        (None, 200),
+        ('"outdated"', 200),
+        (REQUEST_SCHEMA.etag, 304),
+        (f'"outdated", W/{REQUEST_SCHEMA.etag}', 304),
+    ],
+)
+def test_lambda_handler(if_none_match, status_code):
+    headers = {} if if_none_match is None else {"If-None-Match": if_none_match}
+    response = lambda_handler({"headers": headers}, None)
+    assert response["statusCode"] == status_code
+    assert response["headers"]["ETag"] == REQUEST_SCHEMA.etag
+    assert (response["body"] == REQUEST_SCHEMA.body) == (status_code == 200)